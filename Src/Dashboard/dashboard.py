@@ -1,18 +1,35 @@
 """
 Streamlit dashboard for Photo Factory monitoring.
 """
+import codecs
+import heapq
 import logging
 import os
-from datetime import datetime, timedelta
-from typing import Optional
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+from types import MappingProxyType
+from typing import Mapping, Optional
 
 import docker
 import psutil
+import pyarrow as pa
 import streamlit as st
 import streamlit.components.v1 as components
-from sqlalchemy import func
-from streamlit_autorefresh import st_autorefresh
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from streamlit.runtime.scriptrunner_utils.script_run_context import SCRIPT_RUN_CONTEXT_ATTR_NAME
+from sqlalchemy import BigInteger, case, cast, column, false, func, literal_column, select, table
 
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    pd = None
+    PANDAS_AVAILABLE = False
+
+from Src.Dashboard.stats import DashboardStats
 from Src.Shared.database import get_db_session, check_database_connection, init_database
 from Src.Shared.models import MediaAsset, SystemStatus
 from Src.Shared.heartbeat_service import HeartbeatService
@@ -27,9 +44,27 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+
+# Keep-alive connections to the Docker socket; sized for the log fetch pool
+# plus the container poller and concurrent render threads (SDK default is 10)
+DOCKER_MAX_POOL_SIZE = 16
+
+
+@st.cache_resource
+def _get_docker_client():
+    """
+    Create the Docker client once per process.
+    
+    Streamlit re-executes this module on every full rerun, so an uncached
+    docker.from_env() would repeat the client setup and version handshake
+    each time.
+    """
+    return docker.from_env(max_pool_size=DOCKER_MAX_POOL_SIZE)
+
+
 # Initialize Docker client
 try:
-    docker_client = docker.from_env()
+    docker_client = _get_docker_client()
     DOCKER_AVAILABLE = True
 except Exception as e:
     logger.warning(f"Docker client unavailable: {e}")
@@ -37,11 +72,281 @@ except Exception as e:
     DOCKER_AVAILABLE = False
 
 
-@st.cache_data(ttl=5)  # Cache for 5 seconds
+# The All Services log view only asks Docker for lines newer than this
+ALL_LOGS_WINDOW = timedelta(minutes=5)
+
+# Above this many rows "Total Assets Secured" uses the planner's row estimate
+# (pg_class.reltuples) instead of COUNT(*); "Refresh Now" always counts exactly
+TOTAL_ASSETS_ESTIMATE_MIN_ROWS = 1_000_000
+
+# Fields of each recent asset tuple, in the order _query_recent_assets selects them
+RECENT_ASSET_COLUMNS = ("original_name", "size_bytes", "captured_at", "ingested_at", "final_path")
+
+# Size display unit for the recent files table
+BYTES_PER_MB = 1024 * 1024
+
+# Recent files columns stay numeric/datetime; the browser formats them (and
+# sorts them by value rather than as strings)
+RECENT_ASSETS_COLUMN_CONFIG = {
+    "Size": st.column_config.NumberColumn("Size", format="%.2f MB"),
+    "Captured": st.column_config.DatetimeColumn("Captured", format="YYYY-MM-DD HH:mm"),
+    "Ingested": st.column_config.DatetimeColumn("Ingested", format="YYYY-MM-DD HH:mm:ss"),
+}
+
+# Log panels scroll inside a fixed-height box instead of growing the page
+LOG_PANEL_HEIGHT = 400
+
+# Compose project whose containers the dashboard monitors (`name:` in docker-compose.yml)
+COMPOSE_PROJECT_NAME = os.getenv("COMPOSE_PROJECT_NAME", "photo-factory")
+
+# Health suffixes Docker appends to the summary "Status" text (e.g. "Up 2 hours (healthy)")
+_HEALTH_MARKERS = (
+    ("(unhealthy)", "unhealthy"),
+    ("(healthy)", "healthy"),
+    ("(health: starting)", "starting"),
+)
+
+# Container name -> service name used for heartbeats in system_status.
+# Containers without a heartbeat map to None (they still appear in the
+# dashboard); unlisted containers fall back to their prefix before "_".
+CONTAINER_TO_SERVICE = {
+    # Photo Factory core services (with heartbeats)
+    "librarian": "librarian",
+    "dashboard": "dashboard",
+    "factory_postgres": "factory-db",
+    "syncthing": "syncthing",
+    "service_monitor": None,  # Monitor doesn't have its own heartbeat
+    # Immich services (no heartbeats, but should appear in dashboard)
+    "immich_server": None,
+    "immich_machine_learning": None,
+    "immich_redis": None,
+    "immich_postgres": None,
+    # Other services
+    "homepage": None,
+}
+
+# Expected heartbeat interval per service (seconds); read-only, shared with tests
+SERVICE_MAX_INTERVALS: Mapping[str, int] = MappingProxyType({
+    "librarian": 60,      # Updates every 60 seconds
+    "dashboard": 300,     # Updates every 5 minutes
+    "factory-db": 300,    # Monitored every 5 minutes
+    "syncthing": 300,     # Monitored every 5 minutes
+})
+DEFAULT_MAX_INTERVAL = 300  # 5 minutes
+
+
+def resolve_service_name(container_name: str) -> Optional[str]:
+    """
+    Map a container name to its heartbeat service name.
+    
+    Args:
+        container_name: Docker container name
+    
+    Returns:
+        Service name in system_status, or None if the container has no heartbeat
+    """
+    if container_name in CONTAINER_TO_SERVICE:
+        return CONTAINER_TO_SERVICE[container_name]
+    return container_name.split("_")[0]
+
+
+def service_max_interval(service_name: Optional[str]) -> int:
+    """
+    Get a service's expected heartbeat interval.
+    
+    Args:
+        service_name: Service name in system_status (None for no heartbeat)
+    
+    Returns:
+        Interval in seconds, DEFAULT_MAX_INTERVAL for unlisted services
+    """
+    return SERVICE_MAX_INTERVALS.get(service_name, DEFAULT_MAX_INTERVAL)
+
+
+# Heartbeat age indicators, relative to each service's expected interval:
+# within the interval, up to twice the interval, and beyond (critical)
+HEARTBEAT_ICONS = ("🟢", "🟡", "🔴")
+
+
+def _heartbeat_level(seconds_ago: int, max_interval: int) -> int:
+    """
+    Classify a heartbeat age as 0 (on time), 1 (late) or 2 (critical).
+    
+    Args:
+        seconds_ago: Seconds since the last heartbeat
+        max_interval: Expected heartbeat interval of the service in seconds
+    
+    Returns:
+        Index into HEARTBEAT_ICONS
+    """
+    # Each exceeded threshold adds one level; no branches, no tuple per call
+    return (seconds_ago > max_interval) + (seconds_ago > max_interval * 2)
+
+
+def _heartbeat_age(last_heartbeat: datetime, max_interval: int, now: datetime) -> tuple:
+    """
+    Compute a heartbeat's age against the rerun's shared reference time.
+    
+    Args:
+        last_heartbeat: Timestamp of the last heartbeat
+        max_interval: Expected heartbeat interval of the service in seconds
+        now: Reference time for heartbeat ages (shared across the rerun)
+    
+    Returns:
+        Tuple of (seconds_ago, level) where level indexes HEARTBEAT_ICONS
+    """
+    seconds_ago = int((now - last_heartbeat).total_seconds())
+    return seconds_ago, _heartbeat_level(seconds_ago, max_interval)
+
+
+def _heartbeat_label(seconds_ago: int, max_interval: int) -> str:
+    """
+    Format a heartbeat age as "<icon> <elapsed>s/<max_interval>s ago".
+    
+    Args:
+        seconds_ago: Seconds since the last heartbeat
+        max_interval: Expected heartbeat interval of the service in seconds
+    
+    Returns:
+        Label such as "🟢 56s/60s ago"
+    """
+    icon = HEARTBEAT_ICONS[_heartbeat_level(seconds_ago, max_interval)]
+    return f"{icon} {seconds_ago}s/{max_interval}s ago"
+
+
+def _fetch_containers_snapshot() -> dict:
+    """
+    Get a summary of every stack container from a single Docker API call.
+    
+    Uses the low-level /containers/json listing, which already carries name,
+    image, state and health text, instead of inspecting each container.
+    
+    Returns:
+        Dict of container name -> {"status", "health", "running", "image"}
+    
+    Raises:
+        docker.errors.APIError: If the Docker daemon request fails
+    """
+    snapshot = {}
+    # Server-side label filter: the daemon only serializes this stack's containers
+    project_filter = {"label": f"com.docker.compose.project={COMPOSE_PROJECT_NAME}"}
+    for summary in docker_client.api.containers(all=True, filters=project_filter):
+        names = summary.get("Names") or []
+        if not names:
+            continue
+        status_text = summary.get("Status", "")
+        health = next((value for marker, value in _HEALTH_MARKERS if marker in status_text), "unknown")
+        state = summary.get("State", "unknown")
+        snapshot[names[0].lstrip("/")] = {
+            "status": state,
+            "health": health,
+            "running": state == "running",
+            "image": summary.get("Image", ""),
+        }
+    return snapshot
+
+
+class ContainerPoller:
+    """
+    Background poller that keeps the latest container listing in memory.
+    
+    Runs in a daemon thread and refreshes the snapshot every interval
+    seconds, so dashboard reruns read container state without a Docker
+    round trip. If the snapshot is missing or stale (e.g. the Docker daemon
+    stopped answering), snapshot() falls back to a synchronous fetch.
+    """
+    
+    def __init__(self, fetch=_fetch_containers_snapshot, interval: float = 2.0):
+        """
+        Initialize container poller.
+        
+        Args:
+            fetch: Callable returning a fresh container snapshot
+            interval: Seconds between polls (default: 2 seconds)
+        """
+        self.fetch = fetch
+        self.interval = interval
+        # Older snapshots are not trusted; the next read fetches synchronously
+        self.max_age = interval * 3
+        
+        self._lock = threading.Lock()
+        self._snapshot: Optional[dict] = None
+        self._fetched_at = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+    
+    def _refresh(self) -> dict:
+        """Fetch and store a new snapshot."""
+        snapshot = self.fetch()
+        with self._lock:
+            self._snapshot = snapshot
+            self._fetched_at = time.monotonic()
+        return snapshot
+    
+    def _poll_loop(self):
+        """Main polling loop (runs in thread)."""
+        while not self._stop_event.is_set():
+            try:
+                self._refresh()
+            except Exception as e:
+                logger.error(f"Error polling containers: {e}")
+            self._stop_event.wait(self.interval)
+    
+    def snapshot(self) -> dict:
+        """
+        Get the latest container snapshot.
+        
+        Returns:
+            Dict of container name -> container summary
+        
+        Raises:
+            docker.errors.APIError: If a synchronous fallback fetch fails
+        """
+        with self._lock:
+            if self._snapshot is not None and time.monotonic() - self._fetched_at <= self.max_age:
+                return self._snapshot
+        return self._refresh()
+    
+    def start(self):
+        """Start the polling thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._poll_loop, daemon=True, name="container-poller")
+        self._thread.start()
+    
+    def stop(self):
+        """Stop the polling thread."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5.0)
+
+
+@st.cache_resource
+def _get_container_poller() -> ContainerPoller:
+    """
+    Get or create the container poller.
+    
+    Uses @st.cache_resource so a single polling thread is shared by every
+    session and survives script reruns.
+    """
+    poller = ContainerPoller()
+    poller.start()
+    return poller
+
+
+def _list_containers_snapshot() -> dict:
+    """Get the latest container snapshot from the background poller."""
+    return _get_container_poller().snapshot()
+
+
 def get_container_status(container_name: str) -> Optional[dict]:
     """
     Get real-time container status from Docker.
     
+    Looks the container up in the in-memory snapshot kept by the
+    background ContainerPoller, so no Docker round trip happens per call.
+    
     Args:
         container_name: Name of the container
     
@@ -52,20 +357,21 @@ def get_container_status(container_name: str) -> Optional[dict]:
         return None
     
     try:
-        container = docker_client.containers.get(container_name)
-        return {
-            "status": container.status,
-            "health": container.attrs.get("State", {}).get("Health", {}).get("Status", "unknown"),
-            "running": container.status == "running",
-        }
-    except docker.errors.NotFound:
-        return {"status": "not_found", "health": "unknown", "running": False}
+        container = _list_containers_snapshot().get(container_name)
     except Exception as e:
         logger.error(f"Error getting container status: {e}")
         return None
+    
+    if container is None:
+        return {"status": "not_found", "health": "unknown", "running": False}
+    return {
+        "status": container["status"],
+        "health": container["health"],
+        "running": container["running"],
+    }
 
 
-@st.cache_data(ttl=2)  # Cache for 2 seconds for responsive resource display
+@st.cache_data(ttl=2, max_entries=4, show_spinner=False)  # Cache for 2 seconds for responsive resource display
 def get_system_resources() -> dict:
     """
     Get CPU, RAM, and Disk usage for header display.
@@ -117,78 +423,259 @@ def get_system_resources() -> dict:
         }
 
 
-@st.cache_data(ttl=5)  # Cache for 5 seconds to reduce DB load
-def get_librarian_heartbeat() -> Optional[dict]:
-    """Get latest heartbeat from librarian service."""
-    try:
-        with get_db_session() as session:
-            status = session.query(SystemStatus).filter(
-                SystemStatus.service_name == "librarian"
-            ).first()
-            if status:
-                # Access all attributes while still in session context
-                return {
-                    "last_heartbeat": status.last_heartbeat,
-                    "status": status.status,
-                    "current_task": status.current_task,
-                    "updated_at": status.updated_at,
-                }
-            return None
-    except Exception as e:
-        logger.error(f"Error getting heartbeat: {e}")
-        return None
+# After a failed DB probe, skip further probes for this long (per browser session)
+DB_PROBE_BACKOFF_SECONDS = 30
 
 
-@st.cache_data(ttl=10)  # Cache for 10 seconds
-def get_total_assets() -> int:
-    """Get total number of processed assets."""
-    try:
-        with get_db_session() as session:
-            count = session.query(func.count(MediaAsset.id)).scalar()
-            return count or 0
-    except Exception as e:
-        logger.error(f"Error getting total assets: {e}")
-        return 0
+@st.cache_data(ttl=10, max_entries=4, show_spinner=False)  # Cache for 10 seconds (default refresh interval)
+def get_database_health() -> bool:
+    """Check database connectivity, shared across sessions for the TTL."""
+    return check_database_connection()
+
+
+def is_database_connected(now: Optional[datetime] = None) -> bool:
+    """
+    Check database connectivity behind a simple circuit breaker.
+    
+    When a probe fails, further probes are skipped until the backoff
+    expires, so a down database doesn't add a connect timeout to every
+    refresh.
+    
+    Args:
+        now: Reference time of the current rerun (defaults to current time)
+    
+    Returns:
+        True if the database is reachable, False otherwise
+    """
+    now = now or datetime.now()
+    next_probe_at = st.session_state.get("db_next_probe_at")
+    if next_probe_at and now < next_probe_at:
+        return False
+    
+    connected = get_database_health()
+    if connected:
+        st.session_state.pop("db_next_probe_at", None)
+    else:
+        st.session_state["db_next_probe_at"] = now + timedelta(seconds=DB_PROBE_BACKOFF_SECONDS)
+    return connected
+
+
+def _query_service_heartbeat(session, service_name: str) -> Optional[dict]:
+    """Read a service's heartbeat row into a plain dict (inside the open session)."""
+    # Core select of just the displayed columns: no ORM instance/identity map
+    status = session.execute(
+        select(
+            SystemStatus.last_heartbeat,
+            SystemStatus.status,
+            SystemStatus.current_task,
+            SystemStatus.updated_at,
+        ).where(SystemStatus.service_name == service_name)
+    ).first()
+    if status:
+        return {
+            "last_heartbeat": status.last_heartbeat,
+            "status": status.status,
+            "current_task": status.current_task,
+            "updated_at": status.updated_at,
+        }
+    return None
+
+
+def _query_heartbeats(session, service_names) -> dict:
+    """Read the heartbeat rows of several services with one IN query (inside the open session)."""
+    rows = session.execute(
+        select(
+            SystemStatus.service_name,
+            SystemStatus.last_heartbeat,
+            SystemStatus.status,
+            SystemStatus.current_task,
+            SystemStatus.updated_at,
+        ).where(SystemStatus.service_name.in_(service_names))
+    ).all()
+    return {
+        row.service_name: {
+            "last_heartbeat": row.last_heartbeat,
+            "status": row.status,
+            "current_task": row.current_task,
+            "updated_at": row.updated_at,
+        }
+        for row in rows
+    }
+
+
+def _last_hour_cutoff(now: Optional[datetime] = None) -> datetime:
+    """
+    Start of the "last hour" window, bucketed to the minute.
+    
+    Bucketing keeps the window (and any cache key built from `now`) stable
+    across refreshes within the same minute.
+    """
+    return (now or datetime.now()).replace(second=0, microsecond=0) - timedelta(hours=1)
 
 
-@st.cache_data(ttl=30)  # Cache for 30 seconds
-def get_assets_last_hour() -> int:
-    """Get number of assets processed in the last hour."""
+def _asset_row_estimate():
+    """
+    The planner's row estimate for media_assets, as a scalar subquery.
+    
+    pg_class.reltuples is an O(1) catalog lookup, kept within a few percent
+    by autovacuum; it is -1 before the table's first ANALYZE. PostgreSQL only.
+    """
+    pg_class = table("pg_class", column("oid"), column("reltuples"))
+    return (
+        select(cast(pg_class.c.reltuples, BigInteger))
+        .where(pg_class.c.oid == literal_column(f"'{MediaAsset.__tablename__}'::regclass"))
+        .scalar_subquery()
+    )
+
+
+def _query_dashboard_stats(session, now: Optional[datetime] = None, exact_total: bool = False) -> DashboardStats:
+    """
+    Read headline statistics using an open session, in one round trip.
+    
+    The last-hour count is a range count on the ingested_at index and the
+    librarian heartbeat row is LEFT JOINed onto the aggregate row, so one
+    SELECT returns everything. On PostgreSQL, once the planner's row
+    estimate passes TOTAL_ASSETS_ESTIMATE_MIN_ROWS the total is that
+    estimate instead of a full COUNT(*), unless `exact_total` is set; a
+    CASE in the same SELECT makes the choice.
+    """
+    one_hour_ago = _last_hour_cutoff(now)
+    count_all = select(func.count()).select_from(MediaAsset).scalar_subquery()
+    if exact_total or session.get_bind().dialect.name != "postgresql":
+        total = count_all
+        total_is_estimate = false()
+    else:
+        # PostgreSQL runs uncorrelated subqueries lazily, so CASE only
+        # evaluates the branch it picks: large tables never run the COUNT(*)
+        estimate = _asset_row_estimate()
+        total_is_estimate = estimate >= TOTAL_ASSETS_ESTIMATE_MIN_ROWS
+        total = case((total_is_estimate, estimate), else_=count_all)
+    # COUNT(*) keeps the last-hour count an index-only scan on ingested_at
+    counts = select(
+        total.label("total"),
+        total_is_estimate.label("total_is_estimate"),
+        func.count().label("last_hour"),
+    ).select_from(MediaAsset).where(MediaAsset.ingested_at >= one_hour_ago).subquery()
+    # service_name is the primary key, so the join adds at most one row
+    total_assets, is_estimate, last_hour, last_heartbeat, status, current_task, updated_at = session.execute(
+        select(
+            counts.c.total,
+            counts.c.total_is_estimate,
+            counts.c.last_hour,
+            SystemStatus.last_heartbeat,
+            SystemStatus.status,
+            SystemStatus.current_task,
+            SystemStatus.updated_at,
+        )
+        .select_from(counts)
+        .outerjoin(SystemStatus, SystemStatus.service_name == "librarian")
+    ).one()
+    
+    heartbeat = None
+    if last_heartbeat is not None:
+        heartbeat = {
+            "last_heartbeat": last_heartbeat,
+            "status": status,
+            "current_task": current_task,
+            "updated_at": updated_at,
+        }
+    return DashboardStats(
+        total_assets=total_assets or 0,
+        assets_last_hour=last_hour or 0,
+        librarian_heartbeat=heartbeat,
+        # NULL when the catalog has no estimate
+        total_is_estimate=bool(is_estimate),
+    )
+
+
+def _query_recent_assets(session, limit: int) -> list:
+    """Fetch the most recently ingested assets as RECENT_ASSET_COLUMNS tuples using an open session."""
+    # Backward scan on idx_media_assets_ingested_at; stops after `limit` rows.
+    # Core select of the displayed columns, in table order: plain tuples feed
+    # the DataFrame directly (no per-row dicts) and stay picklable for st.cache_data
+    rows = session.execute(
+        select(
+            MediaAsset.original_name,
+            MediaAsset.size_bytes,
+            MediaAsset.captured_at,
+            MediaAsset.ingested_at,
+            MediaAsset.final_path,
+        ).order_by(MediaAsset.ingested_at.desc()).limit(limit)
+    ).all()
+    return [tuple(row) for row in rows]
+
+
+@st.cache_data(ttl=5, max_entries=4, show_spinner=False)  # Cache for 5 seconds
+def dashboard_snapshot(recent_limit: int = 10, now: Optional[datetime] = None, exact_total: bool = False) -> tuple:
+    """
+    Get all overview data in a single database session.
+    
+    Shares one session (one connection checkout) across the overview
+    queries instead of opening a session per getter.
+    
+    Args:
+        recent_limit: Number of recent assets to include
+        now: Minute-bucketed reference time (defaults to the current time)
+        exact_total: Always COUNT(*) the total, even on large tables
+    
+    Returns:
+        Tuple of (DashboardStats, recent_assets)
+    """
     try:
-        with get_db_session() as session:
-            one_hour_ago = datetime.now() - timedelta(hours=1)
-            count = session.query(func.count(MediaAsset.id)).filter(
-                MediaAsset.ingested_at >= one_hour_ago
-            ).scalar()
-            return count or 0
+        with get_db_session(readonly=True) as session:
+            return _query_dashboard_stats(session, now, exact_total), _query_recent_assets(session, recent_limit)
     except Exception as e:
-        logger.error(f"Error getting assets last hour: {e}")
-        return 0
+        logger.error(f"Error getting dashboard snapshot: {e}")
+        return DashboardStats(total_assets=0, assets_last_hour=0, librarian_heartbeat=None), []
+
+
+def _query_data_version(session) -> tuple:
+    """Latest status update and ingest times; any write to the overview data moves one of them."""
+    return tuple(session.execute(
+        select(
+            select(func.max(SystemStatus.updated_at)).scalar_subquery(),
+            select(func.max(MediaAsset.ingested_at)).scalar_subquery(),
+        )
+    ).one())
 
 
-@st.cache_data(ttl=5)  # Cache for 5 seconds
-def get_recent_assets(limit: int = 10):
-    """Get most recently ingested assets."""
+def get_data_version() -> Optional[tuple]:
+    """
+    Get a cheap version stamp of the overview data (two index-backed MAX lookups).
+    
+    Returns:
+        Tuple of (max system_status.updated_at, max media_assets.ingested_at),
+        or None on database errors
+    """
     try:
-        with get_db_session() as session:
-            assets = session.query(MediaAsset).order_by(
-                MediaAsset.ingested_at.desc()
-            ).limit(limit).all()
-            # Convert to dicts to avoid DetachedInstanceError
-            return [
-                {
-                    "id": str(asset.id),
-                    "original_name": asset.original_name,
-                    "final_path": asset.final_path,
-                    "captured_at": asset.captured_at,
-                    "ingested_at": asset.ingested_at,
-                    "size_bytes": asset.size_bytes,
-                }
-                for asset in assets
-            ]
+        with get_db_session(readonly=True) as session:
+            return _query_data_version(session)
     except Exception as e:
-        logger.error(f"Error getting recent assets: {e}")
-        return []
+        logger.error(f"Error getting data version: {e}")
+        return None
+
+
+def refresh_overview_snapshot(previous: Optional[tuple], now: datetime, exact_total: bool = False) -> tuple:
+    """
+    Get the overview snapshot, reusing the previous one while the data is unchanged.
+    
+    The previous snapshot is reused only if the data version and the
+    minute bucket (which moves the "last hour" window) both match; an
+    unknown version (database error) never counts as unchanged.
+    
+    Args:
+        previous: (version, snapshot) returned by the last call, or None
+        now: Minute-bucketed reference time
+        exact_total: Rebuild with an exact total count (manual refresh)
+    
+    Returns:
+        Tuple of (version, (DashboardStats, recent_assets))
+    """
+    data_version = get_data_version()
+    version = (data_version, now)
+    if not exact_total and previous is not None and data_version is not None and previous[0] == version:
+        return previous
+    return version, dashboard_snapshot(recent_limit=10, now=now, exact_total=exact_total)
 
 
 def get_remaining_files() -> Optional[int]:
@@ -213,31 +700,46 @@ def get_librarian_queue_length() -> Optional[int]:
     return None
 
 
-@st.cache_data(ttl=5)  # Cache for 5 seconds
+@st.cache_data(ttl=5, max_entries=16, show_spinner=False)  # Cache for 5 seconds
 def get_service_heartbeat(service_name: str) -> Optional[dict]:
     """Get latest heartbeat from a specific service."""
     try:
-        with get_db_session() as session:
-            status = session.query(SystemStatus).filter(
-                SystemStatus.service_name == service_name
-            ).first()
-            if status:
-                # Access all attributes while still in session context
-                return {
-                    "last_heartbeat": status.last_heartbeat,
-                    "status": status.status,
-                    "current_task": status.current_task,
-                    "updated_at": status.updated_at,
-                }
-            return None
+        with get_db_session(readonly=True) as session:
+            return _query_service_heartbeat(session, service_name)
     except Exception as e:
         logger.error(f"Error getting heartbeat for {service_name}: {e}")
         return None
 
 
-@st.cache_data(ttl=5)  # Cache for 5 seconds
+def get_heartbeats_for(service_names: tuple) -> dict:
+    """
+    Get the latest heartbeats of several services in a single query.
+    
+    Uncached: get_services_table_columns() caches the table built from it.
+    
+    Args:
+        service_names: Service names as stored in system_status
+    
+    Returns:
+        Dict of service name to heartbeat dict; services without a
+        heartbeat row are absent. Empty dict on database errors.
+    """
+    if not service_names:
+        return {}
+    try:
+        with get_db_session(readonly=True) as session:
+            return _query_heartbeats(session, service_names)
+    except Exception as e:
+        logger.error(f"Error getting heartbeats for {', '.join(service_names)}: {e}")
+        return {}
+
+
 def get_all_services_status() -> list:
-    """Get status for all available services."""
+    """
+    Get status for all available services.
+    
+    Uncached: get_services_table_columns() caches the table built from it.
+    """
     services_status = []
     
     if not DOCKER_AVAILABLE:
@@ -245,29 +747,15 @@ def get_all_services_status() -> list:
     
     available_services = get_available_services()
     
-    # Map container names to service names in database
-    # Services without heartbeats are mapped to None (they'll still appear in dashboard)
-    container_to_service_map = {
-        # Photo Factory core services (with heartbeats)
-        "librarian": "librarian",
-        "dashboard": "dashboard",
-        "factory_postgres": "factory-db",
-        "syncthing": "syncthing",
-        "service_monitor": None,  # Monitor doesn't have its own heartbeat
-        # Immich services (no heartbeats, but should appear in dashboard)
-        "immich_server": None,
-        "immich_machine_learning": None,
-        "immich_redis": None,
-        "immich_postgres": None,
-        # Other services
-        "homepage": None,
-    }
+    # Map container names to service names for heartbeat lookup
+    service_names = {container_name: resolve_service_name(container_name) for container_name in available_services}
+    # One IN query for every heartbeat instead of a query per service
+    heartbeats = get_heartbeats_for(tuple(sorted({name for name in service_names.values() if name})))
     
     for container_name in available_services:
         container_status = get_container_status(container_name)
-        # Map container name to service name for heartbeat lookup
-        service_name = container_to_service_map.get(container_name, container_name.split("_")[0] if "_" in container_name else container_name)
-        heartbeat = get_service_heartbeat(service_name) if service_name else None
+        service_name = service_names[container_name]
+        heartbeat = heartbeats.get(service_name) if service_name else None
         
         status_info = {
             "name": container_name,  # Use container name for display
@@ -281,7 +769,57 @@ def get_all_services_status() -> list:
     return services_status
 
 
-@st.cache_data(ttl=30)  # Cache for 30 seconds (services don't change often)
+def _container_status_label(running: bool, health: str) -> str:
+    """
+    Format a container's state for the All Services table.
+    
+    Args:
+        running: Whether the container is running
+        health: Docker health status ("healthy", "unhealthy", "starting", ...)
+    
+    Returns:
+        Label such as "🟢 Healthy" or "🔴 Not Running"
+    """
+    if not running:
+        return "🔴 Not Running"
+    if health == "healthy":
+        return "🟢 Healthy"
+    if health == "unhealthy":
+        return "🔴 Unhealthy"
+    return f"🟡 {health}"
+
+
+@st.cache_data(ttl=5, max_entries=4, show_spinner=False)  # Cache for 5 seconds
+def get_services_table_columns() -> tuple:
+    """
+    Build the All Services table columns in one pass over the service status.
+    
+    This is the only cached layer over the container status and heartbeat
+    reads (stacked TTLs would let the table lag by their sum). Heartbeat ages
+    are relative to each rerun's reference time, so they are not formatted
+    here; the last heartbeat and expected interval are returned instead for
+    the renderer to label.
+    
+    Returns:
+        Tuple of (columns, heartbeat_refs): columns maps "Service", "Status"
+        and "Current Task" to lists of display values; heartbeat_refs holds a
+        (last_heartbeat or None, max_interval) pair per row
+    """
+    columns = {"Service": [], "Status": [], "Current Task": []}
+    heartbeat_refs = []
+    for svc in get_all_services_status():
+        heartbeat = svc["heartbeat"]
+        columns["Service"].append(svc["name"])
+        columns["Status"].append(_container_status_label(svc["container_running"], svc["container_health"]))
+        columns["Current Task"].append(heartbeat.get("current_task", "N/A") if heartbeat else "N/A")
+        heartbeat_refs.append((
+            heartbeat["last_heartbeat"] if heartbeat else None,
+            service_max_interval(svc.get("service_name")),
+        ))
+    return columns, heartbeat_refs
+
+
+@st.cache_data(ttl=30, max_entries=4, show_spinner=False)  # Cache for 30 seconds (services don't change often)
 def get_available_services() -> list:
     """Get list of available Docker services."""
     if not DOCKER_AVAILABLE:
@@ -289,56 +827,10 @@ def get_available_services() -> list:
         return ["librarian", "dashboard", "factory_postgres", "syncthing", "service_monitor"]  # service_monitor is container_name
     
     try:
-        # Get all containers - filter for Photo Factory services
-        containers = docker_client.containers.list(all=True)
-        service_names = []
-        # ALL Photo Factory services - must include everything from docker-compose.yml
-        known_services = [
-            # Photo Factory core services
-            "librarian", 
-            "dashboard", 
-            "factory-db", 
-            "factory_postgres", 
-            "syncthing", 
-            "service_monitor",
-            # Immich services
-            "immich_server",
-            "immich_machine_learning",
-            "immich_redis",
-            "immich_postgres",
-            "homepage",
-        ]
-        
-        # Also check image names for photo-factory prefix
-        all_container_names = []
-        for container in containers:
-            name = container.name
-            all_container_names.append(name)
-            try:
-                image_name = container.image.tags[0] if container.image.tags else ""
-            except:
-                image_name = ""
-            
-            # Check if it's a known service (exact match first, then substring) OR has photo-factory in image name OR container name
-            is_known_service = name in known_services or any(known in name for known in known_services)
-            has_photo_factory = (image_name and "photo-factory" in image_name.lower()) or "photo-factory" in name.lower()
-            
-            # Debug logging for service_monitor
-            if "service" in name.lower() and "monitor" in name.lower():
-                logger.info(f"Service discovery: name='{name}', image='{image_name}', is_known={is_known_service}, has_photo_factory={has_photo_factory}, will_add={is_known_service or has_photo_factory}")
-            
-            if is_known_service or has_photo_factory:
-                service_names.append(name)
-        
-        # Explicitly add service_monitor if it exists in container list (regardless of other checks)
-        if "service_monitor" in all_container_names:
-            if "service_monitor" not in service_names:
-                logger.warning(f"service_monitor found in containers but not added by discovery logic. Adding explicitly.")
-                service_names.append("service_monitor")
-        
-        # Remove duplicates and sort
-        result = sorted(list(set(service_names)))
-        logger.info(f"Final service list: {result}")
+        # The snapshot only holds this compose project's containers (filtered
+        # by label on the Docker side), so every entry is a Photo Factory service
+        result = sorted(_list_containers_snapshot())
+        logger.debug(f"Final service list: {result}")
         return result
     except Exception as e:
         logger.error(f"Error getting available services: {e}")
@@ -346,56 +838,157 @@ def get_available_services() -> list:
         return ["librarian", "dashboard", "factory_postgres", "syncthing", "service_monitor", "immich_server", "immich_machine_learning", "immich_redis", "immich_postgres", "homepage"]
 
 
-@st.cache_data(ttl=2)  # Cache for 2 seconds (logs change frequently)
-def get_service_logs(service_name: str, tail: int = 100) -> str:
+def _stream_log_lines(service_name: str, tail: int, **kwargs):
     """
-    Get logs from a specific service.
+    Stream decoded log lines from a container via the low-level API.
+    
+    Bytes are decoded incrementally (multi-byte characters may straddle
+    chunk boundaries) and split line by line, so the full tail is never
+    held as one decoded string.
     
     Args:
         service_name: Name of the Docker container/service
         tail: Number of lines to retrieve
+        **kwargs: Extra arguments for APIClient.logs (e.g. since)
+    
+    Yields:
+        Non-empty log lines, timestamp-prefixed
+    
+    Raises:
+        docker.errors.NotFound: If the container does not exist
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    # APIClient.logs demultiplexes stdout/stderr frames for non-TTY containers
+    for chunk in docker_client.api.logs(service_name, tail=tail, timestamps=True, stream=True, **kwargs):
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    pending += decoder.decode(b"", final=True)
+    if pending.strip():
+        yield pending
+
+
+def get_incremental_service_logs(service_name: str, tail: int = 100) -> str:
+    """
+    Get recent logs for a service, fetching only lines newer than the last refresh.
+    
+    The last seen timestamp and a bounded line buffer are kept in
+    st.session_state, so each refresh asks Docker for ``since=`` that point
+    instead of re-downloading the whole tail.
+    
+    Args:
+        service_name: Name of the Docker container/service
+        tail: Number of lines to keep
     
     Returns:
-        Logs as string, or empty string if error
+        Logs as string; if a fetch fails, the lines already buffered, or an
+        error note when there are none. Empty string if Docker is unavailable
     """
     if not DOCKER_AVAILABLE:
         return ""
     
+    cursor = st.session_state.setdefault(
+        f"log_cursor_{service_name}", {"last_ts": None, "lines": deque(maxlen=tail)}
+    )
+    last_ts = cursor["last_ts"]
+    lines = cursor["lines"]
+    
+    kwargs = {}
+    if last_ts:
+        # Docker's `since` has one-second resolution; overlap is filtered below
+        kwargs["since"] = int(
+            datetime.strptime(last_ts[:19], "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc).timestamp()
+        )
+    
     try:
-        container = docker_client.containers.get(service_name)
-        logs = container.logs(tail=tail, timestamps=True).decode("utf-8")
-        return logs
+        for line in _stream_log_lines(service_name, tail, **kwargs):
+            # RFC3339Nano timestamps are fixed-width, so string comparison is chronological
+            if last_ts and line.partition(" ")[0] <= last_ts:
+                continue
+            lines.append(line)
     except docker.errors.NotFound:
         return f"[Service '{service_name}' not found]"
     except Exception as e:
         logger.error(f"Error fetching logs from {service_name}: {e}")
-        return ""
-        return f"[Error fetching logs from {service_name}: {e}]"
+        if not lines:
+            return f"[Error fetching logs from {service_name}: {e}]"
+        return "\n".join(lines)
+    
+    if lines:
+        cursor["last_ts"] = lines[-1].partition(" ")[0]
+    return "\n".join(lines)
 
 
-def get_all_logs(services: list, tail: int = 100) -> str:
+def _iter_service_log_lines(service_name: str, tail: int = 50, since: Optional[int] = None):
     """
-    Get and combine logs from all services.
+    Stream timestamped log lines from a single service.
     
     Args:
-        services: List of service names
+        service_name: Name of the Docker container/service
+        tail: Number of lines to retrieve
+        since: Only return lines newer than this Unix timestamp
+    
+    Yields:
+        (timestamp, service_name, message) tuples in container order
+    """
+    kwargs = {"since": since} if since is not None else {}
+    try:
+        for line in _stream_log_lines(service_name, tail, **kwargs):
+            timestamp, _, message = line.partition(" ")
+            yield timestamp, service_name, message
+    except docker.errors.NotFound:
+        return
+    except Exception as e:
+        logger.error(f"Error fetching logs from {service_name}: {e}")
+
+
+# Upper bound on concurrent per-service log fetches
+LOG_FETCH_WORKERS = 8
+
+
+@st.cache_resource
+def _get_log_executor() -> ThreadPoolExecutor:
+    """
+    Get or create the thread pool for per-service log fetches.
+    
+    Uses @st.cache_resource so the worker threads are shared by every
+    session and reused across reruns instead of being started per call.
+    """
+    return ThreadPoolExecutor(max_workers=LOG_FETCH_WORKERS, thread_name_prefix="docker-logs")
+
+
+@st.cache_data(ttl=3, max_entries=4, show_spinner=False)  # Cache for 3 seconds (logs change frequently)
+def get_all_logs(services: tuple, tail: int = 50, limit: int = 100) -> list:
+    """
+    Get the most recent log lines across all services, merged by timestamp.
+    
+    Per-service log fetches are independent Docker API round trips, so they
+    run concurrently on a shared pool (the Docker SDK releases the GIL on
+    socket I/O). Docker bounds each fetch to the last ALL_LOGS_WINDOW and
+    ``tail`` lines. Each service's tail is already in time order, so a heap
+    merge yields a sorted stream and only the newest ``limit`` lines are kept.
+    
+    Args:
+        services: Tuple of service names (immutable, cheap to hash as a cache key)
         tail: Number of lines per service
+        limit: Maximum number of merged lines to return
     
     Returns:
-        Combined logs with service headers
+        List of (timestamp, service_name, message) tuples, oldest first
     """
-    all_logs = []
+    if not DOCKER_AVAILABLE or not services:
+        return []
     
-    for service in services:
-        logs = get_service_logs(service, tail=tail)
-        if logs:
-            # Add service header
-            all_logs.append(f"\n{'='*80}")
-            all_logs.append(f"SERVICE: {service}")
-            all_logs.append(f"{'='*80}\n")
-            all_logs.append(logs)
+    since = int((datetime.now(timezone.utc) - ALL_LOGS_WINDOW).timestamp())
+    # map() keeps the services' order, so the merge below is deterministic
+    per_service = list(_get_log_executor().map(lambda service: list(_iter_service_log_lines(service, tail, since)), services))
     
-    return "\n".join(all_logs)
+    # Docker timestamps are fixed-width RFC3339Nano, so they sort lexically
+    merged = heapq.merge(*per_service, key=lambda entry: entry[0])
+    return list(deque(merged, maxlen=limit))
 
 
 # Initialize heartbeat service (runs in background thread)
@@ -502,117 +1095,81 @@ def render_resource_header() -> str:
 
 
 def render_system_overview(db_connected: bool):
-    """Render system overview section."""
-    st.subheader("System Overview")
-    
-    # Infrastructure status
-    infra_col1, infra_col2 = st.columns(2)
-    with infra_col1:
-        db_status = "🟢 Connected" if db_connected else "🔴 Disconnected"
-        st.write(f"**Database:** {db_status}")
+    """
+    Render system overview section.
     
-    with infra_col2:
-        docker_status = "🟢 Available" if DOCKER_AVAILABLE else "🔴 Unavailable"
-        st.write(f"**Docker:** {docker_status}")
+    Heading, infrastructure status and separator are sent as a single
+    markdown element instead of a subheader, two columns and two writes.
+    """
+    db_status = "🟢 Connected" if db_connected else "🔴 Disconnected"
+    docker_status = "🟢 Available" if DOCKER_AVAILABLE else "🔴 Unavailable"
+    st.markdown(
+        "### System Overview\n"
+        "<div style='display: grid; grid-template-columns: 1fr 1fr; gap: 1rem;'>"
+        f"<div><strong>Database:</strong> {db_status}</div>"
+        f"<div><strong>Docker:</strong> {docker_status}</div>"
+        "</div>\n\n---",
+        unsafe_allow_html=True
+    )
 
 
-def render_all_services_status():
-    """Render all services status table."""
+def render_all_services_status(now: datetime):
+    """
+    Render all services status table.
+    
+    Args:
+        now: Reference time for heartbeat ages (shared across the rerun)
+    """
     st.subheader("All Services Status")
     
-    # Always use fresh data - caching handles performance
-    services_status = get_all_services_status()
+    columns, heartbeat_refs = get_services_table_columns()
     
-    if services_status:
-        # Create a table of all services
-        try:
-            import pandas as pd
-        except ImportError:
-            st.error("pandas not available")
-            return
-        
-        status_data = []
-        for svc in services_status:
-            # Determine status indicator
-            if svc["container_running"]:
-                if svc["container_health"] == "healthy":
-                    status_indicator = "🟢 Healthy"
-                elif svc["container_health"] == "unhealthy":
-                    status_indicator = "🔴 Unhealthy"
-                else:
-                    status_indicator = f"🟡 {svc['container_health']}"
-            else:
-                status_indicator = "🔴 Not Running"
-            
-            # Heartbeat info - always calculate fresh from current time
-            # Format: <elapsed_time>s/<max_interval>s (e.g., 231s/300s or 56s/60s)
-            heartbeat_info = "N/A"
-            if svc["heartbeat"]:
-                # Map service names to their max expected intervals (in seconds)
-                service_max_intervals = {
-                    "librarian": 60,      # Updates every 60 seconds
-                    "dashboard": 300,     # Updates every 5 minutes
-                    "factory-db": 300,    # Monitored every 5 minutes
-                    "syncthing": 300,     # Monitored every 5 minutes
-                }
-                
-                # Get service name for interval lookup
-                service_name = svc.get("service_name")
-                container_name = svc["name"]
-                
-                # Determine max interval based on service name
-                if service_name and service_name in service_max_intervals:
-                    max_interval = service_max_intervals[service_name]
-                elif container_name == "factory_postgres":
-                    max_interval = 300  # factory-db
-                else:
-                    max_interval = 300  # Default to 5 minutes
-                
-                time_since = datetime.now() - svc["heartbeat"]["last_heartbeat"]
-                seconds_ago = int(time_since.total_seconds())
-                
-                # Color logic relative to max_interval:
-                # - <= max_interval: green (within expected interval)
-                # - <= max_interval * 2: yellow (late but not critical)
-                # - > max_interval * 2: red (very late, critical)
-                if seconds_ago <= max_interval:
-                    color = "🟢"
-                elif seconds_ago <= max_interval * 2:
-                    color = "🟡"
-                else:
-                    color = "🔴"
-                
-                # Format: "231s/300s ago" or "56s/60s ago"
-                heartbeat_info = f"{color} {seconds_ago}s/{max_interval}s ago"
-            
-            status_data.append({
-                "Service": svc["name"],
-                "Status": status_indicator,
-                "Heartbeat": heartbeat_info,
-                "Current Task": svc["heartbeat"].get("current_task", "N/A") if svc["heartbeat"] else "N/A",
-            })
+    if columns["Service"]:
+        # Heartbeat info - always calculate fresh from current time
+        # Format: <elapsed_time>s/<max_interval>s (e.g., 231s/300s or 56s/60s)
+        heartbeats = [
+            _heartbeat_label(_heartbeat_age(last_heartbeat, max_interval, now)[0], max_interval)
+            if last_heartbeat else "N/A"
+            for last_heartbeat, max_interval in heartbeat_refs
+        ]
         
-        df = pd.DataFrame(status_data)
-        st.dataframe(df, use_container_width=True, hide_index=True)
+        # Arrow is what st.dataframe serializes to, so build it directly
+        # (pyarrow ships with Streamlit) instead of going through pandas
+        table = pa.table({
+            "Service": columns["Service"],
+            "Status": columns["Status"],
+            "Heartbeat": heartbeats,
+            "Current Task": columns["Current Task"],
+        })
+        st.dataframe(table, use_container_width=True, hide_index=True)
     else:
         st.info("No services found or Docker unavailable")
 
 
-def render_overall_statistics():
-    """Render overall statistics section."""
+def render_overall_statistics(stats: DashboardStats, now: datetime):
+    """
+    Render overall statistics section.
+    
+    Args:
+        stats: Headline statistics from dashboard_snapshot()
+        now: Reference time for heartbeat ages (shared across the rerun)
+    """
     st.subheader("Overall Statistics")
     col1, col2, col3, col4 = st.columns(4)
-    
-    # Always get fresh data - caching handles performance
-    total_assets = get_total_assets()
-    assets_last_hour = get_assets_last_hour()
-    heartbeat = get_librarian_heartbeat()
+    heartbeat = stats.librarian_heartbeat
     
     with col1:
-        st.metric("Total Assets Secured", f"{total_assets:,}")
+        if stats.total_is_estimate:
+            st.metric(
+                "Total Assets Secured",
+                f"~{stats.total_assets:,}",
+                help="Estimated from table statistics; use Refresh Now for an exact count",
+            )
+        else:
+            st.metric("Total Assets Secured", f"{stats.total_assets:,}")
     
     with col2:
-        st.metric("Processed Last Hour", f"{assets_last_hour:,}")
+        st.metric("Processed Last Hour", f"{stats.assets_last_hour:,}")
     
     with col3:
         remaining = get_remaining_files()
@@ -623,65 +1180,109 @@ def render_overall_statistics():
     
     with col4:
         if heartbeat:
-            max_interval = 60  # Librarian updates every 60 seconds
-            time_since = datetime.now() - heartbeat["last_heartbeat"]
-            seconds_ago = int(time_since.total_seconds())
-            # Color logic relative to max_interval
-            if seconds_ago <= max_interval:
-                st.metric("Librarian Heartbeat", f"🟢 {seconds_ago}s/{max_interval}s ago")
-            elif seconds_ago <= max_interval * 2:
-                st.metric("Librarian Heartbeat", f"🟡 {seconds_ago}s/{max_interval}s ago")
-            else:
-                st.metric("Librarian Heartbeat", f"🔴 {seconds_ago}s/{max_interval}s ago")
+            max_interval = SERVICE_MAX_INTERVALS["librarian"]
+            seconds_ago, _ = _heartbeat_age(heartbeat["last_heartbeat"], max_interval, now)
+            st.metric("Librarian Heartbeat", _heartbeat_label(seconds_ago, max_interval))
         else:
             st.metric("Librarian Heartbeat", "N/A")
 
 
-def render_latest_files():
-    """Render latest processed files section."""
-    st.subheader("📁 Latest Processed Files")
-    recent_assets = get_recent_assets(limit=10)
+@st.cache_data(ttl=60, max_entries=4, show_spinner=False)  # Cache for 60 seconds (output depends only on the input rows)
+def build_recent_assets_frame(recent_assets: list):
+    """
+    Build the "Latest Processed Files" table from recent asset tuples.
     
-    if recent_assets:
-        try:
-            import pandas as pd
-        except ImportError:
-            st.error("pandas not available")
-            return
-        
-        data = []
-        for asset in recent_assets:
-            data.append({
-                "File": asset.get("original_name", "Unknown"),
-                "Size": f"{asset.get('size_bytes', 0) / 1024 / 1024:.2f} MB",
-                "Captured": asset.get("captured_at").strftime("%Y-%m-%d %H:%M") if asset.get("captured_at") else "N/A",
-                "Ingested": asset.get("ingested_at").strftime("%Y-%m-%d %H:%M:%S") if asset.get("ingested_at") else "N/A",
-                "Path": asset.get("final_path", "N/A")[:50] + "..." if len(asset.get("final_path", "")) > 50 else asset.get("final_path", "N/A"),
-            })
-        
-        df = pd.DataFrame(data)
-        st.dataframe(df, use_container_width=True, hide_index=True)
-    else:
+    Columns are built with column-wise pandas operations instead of a
+    per-row Python loop. Size (MB) and timestamps stay numeric/datetime and
+    are formatted client-side via RECENT_ASSETS_COLUMN_CONFIG. The frame is
+    cached by the (small) input rows, so refreshes that return the same
+    recent assets skip the rebuild.
+    
+    Args:
+        recent_assets: Recently ingested assets as RECENT_ASSET_COLUMNS tuples
+    
+    Returns:
+        DataFrame with File, Size, Captured, Ingested and Path columns
+    """
+    df = pd.DataFrame.from_records(recent_assets, columns=RECENT_ASSET_COLUMNS)
+    paths = df["final_path"].fillna("N/A")
+    return pd.DataFrame({
+        "File": df["original_name"].fillna("Unknown"),
+        "Size": df["size_bytes"].fillna(0) / BYTES_PER_MB,
+        "Captured": pd.to_datetime(df["captured_at"]),
+        "Ingested": pd.to_datetime(df["ingested_at"]),
+        "Path": paths.where(paths.str.len() <= 50, paths.str.slice(0, 50) + "..."),
+    })
+
+
+def _render_recent_assets_table(recent_assets: list):
+    """Render recent assets as a dataframe (or an info message if there are none)."""
+    if not recent_assets:
         st.info("No files processed yet")
+        return
+    
+    if not PANDAS_AVAILABLE:
+        st.error("pandas not available")
+        return
+    
+    st.dataframe(
+        build_recent_assets_frame(recent_assets),
+        use_container_width=True,
+        hide_index=True,
+        column_config=RECENT_ASSETS_COLUMN_CONFIG,
+    )
+
+
+def render_latest_files(recent_assets: list):
+    """
+    Render latest processed files section.
+    
+    Args:
+        recent_assets: Recently ingested assets as RECENT_ASSET_COLUMNS tuples
+    """
+    st.subheader("📁 Latest Processed Files")
+    
+    _render_recent_assets_table(recent_assets)
 
 
+@st.fragment
 def render_all_logs(available_services: list):
-    """Render all services logs section."""
+    """
+    Render all services logs section.
+    
+    Runs as a nested fragment: flipping the "Show logs" toggle reruns only
+    this panel, not the live view's overview queries and tables.
+    
+    Args:
+        available_services: Container names whose logs are merged
+    """
     st.subheader("📋 All Services Logs")
+    # Log fetches are Docker round trips; skip them unless the panel is open
+    if not st.toggle("Show logs", key="show_logs_all_services"):
+        return
     if DOCKER_AVAILABLE and available_services:
-        all_logs = get_all_logs(available_services, tail=50)
-        if all_logs:
-            log_lines = [line for line in all_logs.split('\n') if line.strip()]
-            recent_logs = '\n'.join(log_lines[-100:])
-            st.code(recent_logs, language=None)
+        log_lines = get_all_logs(tuple(available_services), tail=50, limit=100)
+        if log_lines:
+            with st.container(height=LOG_PANEL_HEIGHT):
+                st.code(
+                    "\n".join(f"{timestamp} [{service}] {message}" for timestamp, service, message in log_lines),
+                    language=None,
+                )
         else:
-            st.info("No logs available")
+            st.info(f"No logs in the last {int(ALL_LOGS_WINDOW.total_seconds() // 60)} minutes")
     else:
         st.warning("Docker unavailable - cannot fetch logs")
 
 
-def render_service_details(selected_service: str):
-    """Render service-specific details."""
+def render_service_details(selected_service: str, now: datetime, exact_total: bool = False):
+    """
+    Render service-specific details.
+    
+    Args:
+        selected_service: Container name picked in the header selector
+        now: Reference time for heartbeat ages (shared across the rerun)
+        exact_total: Count the librarian's total exactly (manual refresh)
+    """
     service_display_name = selected_service.replace("_", " ").replace("-", " ").title()
     st.subheader(f"📊 {service_display_name} Service Details")
     
@@ -706,34 +1307,14 @@ def render_service_details(selected_service: str):
     
     with status_col2:
         # Get heartbeat if available
-        service_name_for_heartbeat = selected_service.split("_")[0] if "_" in selected_service else selected_service
-        # Map container names to service names
-        if selected_service == "factory_postgres":
-            service_name_for_heartbeat = "factory-db"
-        elif selected_service == "syncthing":
-            service_name_for_heartbeat = "syncthing"  # Explicit mapping for syncthing
-        
-        heartbeat = get_service_heartbeat(service_name_for_heartbeat)
-        
-        # Map service names to their max expected intervals (in seconds)
-        service_max_intervals = {
-            "librarian": 60,      # Updates every 60 seconds
-            "dashboard": 300,     # Updates every 5 minutes
-            "factory-db": 300,    # Monitored every 5 minutes
-            "syncthing": 300,     # Monitored every 5 minutes
-        }
+        service_name = resolve_service_name(selected_service)
+        heartbeat = get_service_heartbeat(service_name) if service_name else None
         
         if heartbeat:
-            max_interval = service_max_intervals.get(service_name_for_heartbeat, 300)  # Default to 5 minutes
-            time_since = datetime.now() - heartbeat["last_heartbeat"]
-            seconds_ago = int(time_since.total_seconds())
-            # Color logic relative to max_interval
-            if seconds_ago <= max_interval:
-                st.success(f"💓 Heartbeat: {seconds_ago}s/{max_interval}s ago")
-            elif seconds_ago <= max_interval * 2:
-                st.warning(f"💓 Heartbeat: {seconds_ago}s/{max_interval}s ago")
-            else:
-                st.error(f"💓 Heartbeat: {seconds_ago}s/{max_interval}s ago")
+            max_interval = service_max_interval(service_name)
+            seconds_ago, level = _heartbeat_age(heartbeat["last_heartbeat"], max_interval, now)
+            show = (st.success, st.warning, st.error)[level]
+            show(f"💓 Heartbeat: {seconds_ago}s/{max_interval}s ago")
             
             if heartbeat.get("current_task"):
                 st.caption(f"Current Task: {heartbeat['current_task']}")
@@ -747,12 +1328,21 @@ def render_service_details(selected_service: str):
         # Librarian-specific data
         st.subheader("📈 Librarian Metrics")
         metric_col1, metric_col2, metric_col3, metric_col4 = st.columns(4)
+        # Metrics and the recent files table below share one DB session
+        stats, recent_assets = dashboard_snapshot(recent_limit=20, now=now.replace(second=0), exact_total=exact_total)
         
         with metric_col1:
-            st.metric("Total Assets Processed", f"{get_total_assets():,}")
+            if stats.total_is_estimate:
+                st.metric(
+                    "Total Assets Processed",
+                    f"~{stats.total_assets:,}",
+                    help="Estimated from table statistics; use Refresh Now for an exact count",
+                )
+            else:
+                st.metric("Total Assets Processed", f"{stats.total_assets:,}")
         
         with metric_col2:
-            st.metric("Processed Last Hour", f"{get_assets_last_hour():,}")
+            st.metric("Processed Last Hour", f"{stats.assets_last_hour:,}")
         
         with metric_col3:
             queue_length = get_librarian_queue_length()
@@ -774,40 +1364,34 @@ def render_service_details(selected_service: str):
         
         # Latest Processed Files by Librarian
         st.subheader("📁 Latest Processed Files")
-        recent_assets = get_recent_assets(limit=20)
-        
-        if recent_assets:
-            try:
-                import pandas as pd
-            except ImportError:
-                st.error("pandas not available")
-                return
-            
-            data = []
-            for asset in recent_assets:
-                data.append({
-                    "File": asset.get("original_name", "Unknown"),
-                    "Size": f"{asset.get('size_bytes', 0) / 1024 / 1024:.2f} MB",
-                    "Captured": asset.get("captured_at").strftime("%Y-%m-%d %H:%M") if asset.get("captured_at") else "N/A",
-                    "Ingested": asset.get("ingested_at").strftime("%Y-%m-%d %H:%M:%S") if asset.get("ingested_at") else "N/A",
-                    "Path": asset.get("final_path", "N/A")[:50] + "..." if len(asset.get("final_path", "")) > 50 else asset.get("final_path", "N/A"),
-                })
-            
-            df = pd.DataFrame(data)
-            st.dataframe(df, use_container_width=True, hide_index=True)
-        else:
-            st.info("No files processed yet")
+        _render_recent_assets_table(recent_assets)
     
     st.markdown("---")
     
-    # Service Logs
+    render_service_logs(selected_service, service_display_name)
+
+
+@st.fragment
+def render_service_logs(selected_service: str, service_display_name: str):
+    """
+    Render the selected service's logs section.
+    
+    Runs as a nested fragment: flipping the "Show logs" toggle reruns only
+    this panel, not the service details above it.
+    
+    Args:
+        selected_service: Container name picked in the header selector
+        service_display_name: Title-cased name shown in the subheader
+    """
     st.subheader(f"📋 {service_display_name} Logs")
+    # Log fetches are Docker round trips; skip them unless the panel is open
+    if not st.toggle("Show logs", key=f"show_logs_{selected_service}"):
+        return
     if DOCKER_AVAILABLE:
-        logs = get_service_logs(selected_service, tail=200)
+        logs = get_incremental_service_logs(selected_service, tail=100)
         if logs:
-            log_lines = logs.strip().split('\n')
-            recent_logs = '\n'.join(log_lines[-100:])  # Show last 100 lines
-            st.code(recent_logs, language=None)
+            with st.container(height=LOG_PANEL_HEIGHT):
+                st.code(logs, language=None)
         else:
             st.info(f"No logs available for {selected_service}")
     else:
@@ -1037,67 +1621,127 @@ def main():
     # Static title (no flicker)
     st.title("📸 Photo Factory Dashboard")
     
-    # Create persistent containers at TOP of main() for flicker-free updates
-    header_container = st.empty()
-    st.markdown("---")  # Separator after header
-    overview_container = st.empty()
-    services_container = st.empty()
-    stats_container = st.empty()
-    files_container = st.empty()
-    logs_container = st.empty()
-    # Container for service-specific view
-    service_details_container = st.empty()
-    
-    # Check database connection (used by multiple sections)
-    db_connected = check_database_connection()
-    
-    # Get available services for header and logs
-    available_services = get_available_services()
-    
-    # Auto-refresh in sidebar (minimal)
+    # Auto-refresh controls in sidebar (minimal)
     with st.sidebar:
         # Initialize session state (persists across reruns)
         if "auto_refresh_enabled" not in st.session_state:
             st.session_state.auto_refresh_enabled = True
         if "refresh_interval" not in st.session_state:
             st.session_state.refresh_interval = 10
-        if "refresh_key_counter" not in st.session_state:
-            st.session_state.refresh_key_counter = 0
-        if "is_refreshing" not in st.session_state:
-            st.session_state.is_refreshing = False
         
         auto_refresh = st.checkbox("Auto-refresh", value=st.session_state.auto_refresh_enabled, key="auto_refresh_checkbox")
         refresh_interval = st.slider("Interval (sec)", 5, 60, st.session_state.refresh_interval, key="refresh_interval_slider")
         
-        # Check if interval changed - if so, increment counter to force refresh component restart
-        if refresh_interval != st.session_state.get("last_refresh_interval", refresh_interval):
-            st.session_state.refresh_key_counter += 1
-        st.session_state.last_refresh_interval = refresh_interval
-        
         # Update session state when values change
         st.session_state.auto_refresh_enabled = auto_refresh
         st.session_state.refresh_interval = refresh_interval
         
         if st.button("🔄 Refresh Now", key="refresh_button"):
-            # Mark as refreshing and clear cache
-            st.session_state.is_refreshing = True
+            # Clear cached data (and any open DB circuit) and rerun the whole script
             st.cache_data.clear()
+            st.session_state.pop("db_next_probe_at", None)
+            st.session_state.pop("overview_snapshot", None)
+            st.session_state["exact_total_requested"] = True
             st.rerun()
         
-        # Use streamlit-autorefresh for reliable auto-refresh
         if auto_refresh:
             st.info(f"🔄 Auto-refreshing every {refresh_interval}s")
-            
-            # Simple approach: always use fresh data, just show a subtle refresh indicator
-            # The refresh happens so fast that preserving old state causes more problems
-            st.session_state.is_refreshing = False  # Always use fresh data
-            
-            # Convert seconds to milliseconds for st_autorefresh
-            # Use counter in key to force restart when interval changes
-            st_autorefresh(
-                interval=refresh_interval * 1000, 
-                key=f"dashboard_refresh_{st.session_state.refresh_key_counter}"
-            )
+    
+    # Live panels run as a fragment: on each tick only this subtree reruns
+    # (no sidebar rebuild, CSS/JS re-injection or page reload). Changing the
+    # slider reruns the full script, which re-registers the fragment with the
+    # new interval.
+    run_every = st.session_state.refresh_interval if st.session_state.auto_refresh_enabled else None
+    st.fragment(run_every=run_every)(render_live_view)()
+
+
+# Upper bound on concurrent prefetches; the pool is shared by every session
+PREFETCH_WORKERS = 8
+
+
+@st.cache_resource
+def _get_prefetch_executor() -> ThreadPoolExecutor:
+    """
+    Get or create the thread pool for the live view's cache prefetches.
+    
+    Uses @st.cache_resource so the worker threads are shared by every
+    session and reused across refreshes instead of being started per tick.
+    """
+    return ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="dashboard-prefetch")
+
+
+def _run_with_script_ctx(ctx, fn, *args):
+    """
+    Run fn on a pool thread under the submitting session's script run context.
+    
+    Pool threads serve many sessions, so the context is attached per task
+    and detached again afterwards; a context left behind would let a later
+    st.* call on the thread write into another user's session.
+    """
+    thread = threading.current_thread()
+    previous = get_script_run_ctx(suppress_warning=True)
+    add_script_run_ctx(thread, ctx)
+    try:
+        return fn(*args)
+    finally:
+        # add_script_run_ctx ignores a None context, so restore the attribute directly
+        setattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME, previous)
+
+
+def render_live_view():
+    """
+    Render the auto-refreshing part of the dashboard (header + selected view).
+    
+    Called as an st.fragment from main() so periodic refreshes only rerun
+    this function rather than the entire script.
+    """
+    # Create persistent containers for flicker-free updates
+    header_container = st.empty()
+    st.markdown("---")  # Separator after header
+    overview_container = st.empty()
+    services_container = st.empty()
+    stats_container = st.empty()
+    files_container = st.empty()
+    logs_container = st.empty()
+    # Container for service-specific view
+    service_details_container = st.empty()
+    
+    # One reference time per rerun so every panel agrees on "now"
+    now = datetime.now().replace(microsecond=0)
+    # Minute-bucketed `now` keeps the overview cache keys stable between refreshes
+    overview_now = now.replace(second=0)
+    overview_future = None
+    # Set by the "Refresh Now" button: count the total exactly this run, in
+    # whichever view renders (both show the asset total)
+    exact_total = st.session_state.pop("exact_total_requested", False)
+    
+    # Warm the caches of independent Docker/DB/psutil reads concurrently so
+    # the render calls below are cache hits (latency ~ slowest call, not the
+    # sum). The selector value from the previous run tells us which view's
+    # data is needed.
+    ctx = get_script_run_ctx()
+    executor = _get_prefetch_executor()
+    prefetches = [
+        executor.submit(_run_with_script_ctx, ctx, get_system_resources),
+        executor.submit(_run_with_script_ctx, ctx, get_available_services),
+    ]
+    if st.session_state.get("service_selector", "All Services") == "All Services":
+        # Session state is read here; the worker only gets plain values
+        overview_future = executor.submit(
+            _run_with_script_ctx, ctx,
+            refresh_overview_snapshot, st.session_state.get("overview_snapshot"), overview_now, exact_total,
+        )
+        prefetches += [overview_future, executor.submit(_run_with_script_ctx, ctx, get_services_table_columns)]
+    
+    # Check database connection (used by multiple sections) while the
+    # prefetches run; it stays on this thread because the circuit breaker
+    # lives in session state
+    db_connected = is_database_connected(now)
+    # Render only once every prefetch has landed
+    wait(prefetches)
+    
+    # Get available services for header and logs
+    available_services = get_available_services()
     
     # Render header with resource bar + service selector
     with header_container.container():
@@ -1108,21 +1752,28 @@ def main():
         # Clear service details container (not used in All Services view)
         service_details_container.empty()
         
+        # Overview DB data from one session, reused while the data version is unchanged
+        if overview_future is not None:
+            overview = overview_future.result()
+        else:
+            overview = refresh_overview_snapshot(st.session_state.get("overview_snapshot"), overview_now, exact_total)
+        st.session_state["overview_snapshot"] = overview
+        stats, recent_assets = overview[1]
+        
         # Render each section in its container
         with overview_container.container():
             render_system_overview(db_connected)
-            st.markdown("---")
         
         with services_container.container():
-            render_all_services_status()
+            render_all_services_status(now)
             st.markdown("---")
         
         with stats_container.container():
-            render_overall_statistics()
+            render_overall_statistics(stats, now)
             st.markdown("---")
         
         with files_container.container():
-            render_latest_files()
+            render_latest_files(recent_assets)
             st.markdown("---")
         
         with logs_container.container():
@@ -1138,8 +1789,7 @@ def main():
         
         # Render service-specific details in its container
         with service_details_container.container():
-            render_service_details(selected_service)
-
+            render_service_details(selected_service, now, exact_total)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,19 @@
+"""
+Value types returned by the dashboard's cached data functions.
+
+st.cache_data pickles return values, and pickle looks classes up by module.
+Streamlit runs dashboard.py as a fresh ``__main__`` module on every rerun
+(fragment ticks included), so classes defined there cannot be found again;
+they live here, in an importable module, instead.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class DashboardStats:
+    """Headline statistics for the overview panel (one DB round trip)."""
+    total_assets: int
+    assets_last_hour: int
+    librarian_heartbeat: Optional[dict]
+    total_is_estimate: bool = False
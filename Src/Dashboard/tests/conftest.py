@@ -8,6 +8,7 @@ This conftest.py provides:
 """
 from datetime import datetime, timedelta
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Generator
 from unittest.mock import MagicMock, patch
 
@@ -17,6 +18,20 @@ import pytest
 # =============================================================================
 # Dashboard-Specific Fixtures
 # =============================================================================
+@pytest.fixture(autouse=True)
+def clear_dashboard_caches():
+    """
+    Start every Dashboard test with empty st.cache_data caches.
+    
+    Cached getters would otherwise serve results built from an earlier
+    test's mocks. Clearing here replaces per-test ``fn.clear()`` calls and
+    covers caches added later without touching the tests.
+    """
+    import streamlit as st
+    st.cache_data.clear()
+    yield
+
+
 @pytest.fixture
 def mock_streamlit():
     """
@@ -48,19 +63,40 @@ def mock_dashboard_db_session():
     mock_session.__enter__ = MagicMock(return_value=mock_session)
     mock_session.__exit__ = MagicMock(return_value=None)
     
-    # Mock system status result
-    mock_status = MagicMock()
-    mock_status.service_name = "librarian"
-    mock_status.status = "OK"
-    mock_status.last_heartbeat = datetime.now()
-    mock_status.current_task = "idle"
+    # System status row: plain attributes only, so no lazily created child mocks
+    mock_status = SimpleNamespace(
+        service_name="librarian",
+        status="OK",
+        last_heartbeat=datetime.now(),
+        current_task="idle",
+    )
     
-    mock_session.query.return_value.filter.return_value.first.return_value = mock_status
+    mock_session.execute.return_value.first.return_value = mock_status
     mock_session.query.return_value.all.return_value = [mock_status]
     
     return mock_session
 
 
+@pytest.fixture
+def db_session(monkeypatch):
+    """
+    Patch the dashboard's get_db_session to yield one MagicMock session.
+    
+    MagicMock wires __enter__/__exit__, so tests only set query results:
+    
+    Usage:
+        def test_heartbeat(db_session):
+            db_session.execute.return_value.first.return_value = status_row
+            result = get_service_heartbeat("librarian")
+    """
+    session = MagicMock()
+    session.__enter__.return_value = session
+    # A truthy __exit__ would swallow exceptions raised inside the session block
+    session.__exit__.return_value = False
+    monkeypatch.setattr("Src.Dashboard.dashboard.get_db_session", MagicMock(return_value=session))
+    return session
+
+
 @pytest.fixture
 def sample_heartbeat_data():
     """
@@ -105,19 +141,20 @@ def mock_docker_containers():
     Returns mock containers that simulate Photo Factory services.
     """
     def create_mock_container(name: str, status: str, health: str = "healthy"):
-        container = MagicMock()
-        container.name = name
-        container.status = status
-        container.attrs = {
-            "State": {"Health": {"Status": health}} if health else {"Status": status},
-            "Config": {
-                "Labels": {
-                    "com.docker.compose.project": "photo_factory",
-                    "com.docker.compose.service": name.replace("photo_factory_", "").replace("_1", "")
+        # Tests only read these attributes; SimpleNamespace avoids MagicMock overhead
+        return SimpleNamespace(
+            name=name,
+            status=status,
+            attrs={
+                "State": {"Health": {"Status": health}} if health else {"Status": status},
+                "Config": {
+                    "Labels": {
+                        "com.docker.compose.project": "photo_factory",
+                        "com.docker.compose.service": name.replace("photo_factory_", "").replace("_1", "")
+                    }
                 }
-            }
-        }
-        return container
+            },
+        )
     
     return [
         create_mock_container("photo_factory_librarian_1", "running", "healthy"),
@@ -5,381 +5,207 @@ Verifies that heartbeat displays show correct colors based on ratio calculations
 """
 import pytest
 from datetime import datetime, timedelta
-from unittest.mock import Mock, patch
-
-from Src.Dashboard.dashboard import get_all_services_status, get_service_heartbeat
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from Src.Dashboard.dashboard import (
+    HEARTBEAT_ICONS,
+    _heartbeat_age,
+    _heartbeat_label,
+    _heartbeat_level,
+    get_all_services_status,
+    get_services_table_columns,
+    service_max_interval,
+)
+
+
+@pytest.fixture
+def syncthing_container(monkeypatch):
+    """Make Docker report a single running, healthy syncthing container."""
+    monkeypatch.setattr('Src.Dashboard.dashboard.DOCKER_AVAILABLE', True)
+    monkeypatch.setattr('Src.Dashboard.dashboard.get_available_services', Mock(return_value=["syncthing"]))
+    monkeypatch.setattr(
+        'Src.Dashboard.dashboard.get_container_status', Mock(return_value={"running": True, "health": "healthy"})
+    )
 
 
 class TestColorCodingLogic:
     """Test the color coding logic directly."""
     
-    def test_syncthing_109s_should_be_green(self):
-        """Test syncthing at 109s should show green (109 <= 300)."""
-        expected_interval = 300
-        seconds_ago = 109
-        
-        # Implementation uses seconds_ago <= max_interval for green
-        assert seconds_ago <= expected_interval, f"{seconds_ago}s should be <= {expected_interval}s for green"
+    # Green up to and including the interval, yellow up to and including
+    # twice the interval, red beyond
+    @pytest.mark.parametrize("expected_interval,seconds_ago,expected_color", [
+        (300, 109, "🟢"),
+        (300, 250, "🟢"),
+        (300, 299, "🟢"),
+        (300, 300, "🟢"),  # boundary: exactly at interval is still green
+        (300, 301, "🟡"),
+        (300, 350, "🟡"),
+        (300, 450, "🟡"),
+        (300, 600, "🟡"),  # boundary: exactly at 2x interval is still yellow
+        (300, 601, "🔴"),
+        (300, 900, "🔴"),
+        (60, 41, "🟢"),
+        (60, 60, "🟢"),
+        (60, 90, "🟡"),
+        (60, 120, "🟡"),
+        (60, 121, "🔴"),
+    ])
+    def test_heartbeat_color(self, expected_interval, seconds_ago, expected_color):
+        """Test that a heartbeat age maps to the right color for its service interval."""
+        color = HEARTBEAT_ICONS[_heartbeat_level(seconds_ago, expected_interval)]
+        
+        assert color == expected_color, f"{seconds_ago}s/{expected_interval}s should be {expected_color}, got {color}"
+
+
+class TestColorCodingDisplay:
+    """Test the full display pipeline with mocked data."""
     
-    def test_syncthing_250s_should_be_green(self):
-        """Test syncthing at 250s should show green (250 <= 300)."""
-        expected_interval = 300
-        seconds_ago = 250
+    @pytest.fixture
+    def syncthing_heartbeat_age(self, monkeypatch, syncthing_container):
+        """Serve one running syncthing container; returns a setter for its heartbeat age."""
+        mock_heartbeats = Mock(return_value={})
+        monkeypatch.setattr('Src.Dashboard.dashboard.get_heartbeats_for', mock_heartbeats)
         
-        assert seconds_ago <= expected_interval, f"{seconds_ago}s should be <= {expected_interval}s for green"
-    
-    def test_syncthing_299s_should_be_green(self):
-        """Test syncthing at 299s should show green (299 <= 300) - edge case."""
-        expected_interval = 300
-        seconds_ago = 299
+        def set_age(seconds_ago: int) -> datetime:
+            """Set the heartbeat age relative to a fresh reference time and return that time."""
+            now = datetime.now()
+            mock_heartbeats.return_value = {
+                "syncthing": {"last_heartbeat": now - timedelta(seconds=seconds_ago), "status": "OK"}
+            }
+            return now
         
-        assert seconds_ago <= expected_interval, f"{seconds_ago}s should be <= {expected_interval}s for green"
+        return set_age
     
-    def test_syncthing_300s_should_be_green(self):
-        """Test syncthing at 300s should show green (300 <= 300) - boundary case.
+    # 600s would still be yellow (600 <= 600), so 601s is the first red age
+    @pytest.mark.parametrize("age,expected_color", [(109, "🟢"), (350, "🟡"), (601, "🔴")])
+    def test_syncthing_color_in_status_data(self, syncthing_heartbeat_age, age, expected_color):
+        """Test that syncthing's heartbeat age from status data classifies to the right color."""
+        now = syncthing_heartbeat_age(age)
         
-        Implementation uses <= for green, so exactly at interval is still green.
-        """
-        expected_interval = 300
-        seconds_ago = 300
+        result = get_all_services_status()
         
-        # At exactly the interval boundary, implementation shows GREEN
-        assert seconds_ago <= expected_interval, f"{seconds_ago}s should be <= {expected_interval}s for green"
-    
-    def test_syncthing_301s_should_be_yellow(self):
-        """Test syncthing at 301s should show yellow (301 > 300, 301 <= 600)."""
-        expected_interval = 300
-        seconds_ago = 301
+        assert len(result) == 1
+        svc = result[0]
+        assert svc["heartbeat"] is not None
         
-        # Implementation: max_interval < seconds_ago <= max_interval * 2 is yellow
-        assert seconds_ago > expected_interval, f"{seconds_ago}s should be > {expected_interval}s"
-        assert seconds_ago <= expected_interval * 2, f"{seconds_ago}s should be <= {expected_interval * 2}s for yellow"
-    
-    def test_syncthing_350s_should_be_yellow(self):
-        """Test syncthing at 350s should show yellow (300 < 350 <= 600)."""
-        expected_interval = 300
-        seconds_ago = 350
+        expected_interval = service_max_interval(svc.get("service_name"))
+        seconds_ago, _ = _heartbeat_age(svc["heartbeat"]["last_heartbeat"], expected_interval, now)
+        assert seconds_ago == age, f"Expected {age}s, got {seconds_ago}s"
         
-        assert seconds_ago > expected_interval, f"{seconds_ago}s should be > {expected_interval}s"
-        assert seconds_ago <= expected_interval * 2, f"{seconds_ago}s should be <= {expected_interval * 2}s for yellow"
-    
-    def test_syncthing_450s_should_be_yellow(self):
-        """Test syncthing at 450s should show yellow (300 < 450 <= 600)."""
-        expected_interval = 300
-        seconds_ago = 450
+        # Classify with the dashboard's own helper
+        color = HEARTBEAT_ICONS[_heartbeat_level(seconds_ago, expected_interval)]
         
-        assert seconds_ago > expected_interval, f"{seconds_ago}s should be > {expected_interval}s"
-        assert seconds_ago <= expected_interval * 2, f"{seconds_ago}s should be <= {expected_interval * 2}s for yellow"
+        assert color == expected_color, f"Expected {expected_color}, got {color} for {seconds_ago}s"
     
-    def test_syncthing_600s_should_be_yellow(self):
-        """Test syncthing at 600s should show yellow (300 < 600 <= 600) - boundary case.
+    def test_service_name_mapping_syncthing(self, syncthing_heartbeat_age):
+        """Test that container name 'syncthing' correctly maps to service name 'syncthing'."""
+        syncthing_heartbeat_age(109)
         
-        Implementation uses <= for yellow boundary, so exactly at 2x interval is still yellow.
-        """
-        expected_interval = 300
-        seconds_ago = 600
+        result = get_all_services_status()
         
-        assert seconds_ago > expected_interval, f"{seconds_ago}s should be > {expected_interval}s"
-        assert seconds_ago <= expected_interval * 2, f"{seconds_ago}s should be <= {expected_interval * 2}s for yellow"
-    
-    def test_syncthing_601s_should_be_red(self):
-        """Test syncthing at 601s should show red (601 > 600)."""
-        expected_interval = 300
-        seconds_ago = 601
+        assert len(result) == 1
+        svc = result[0]
         
-        # Implementation: seconds_ago > max_interval * 2 is red
-        assert seconds_ago > expected_interval * 2, f"{seconds_ago}s should be > {expected_interval * 2}s for red"
-    
-    def test_syncthing_900s_should_be_red(self):
-        """Test syncthing at 900s should show red (900 > 600)."""
-        expected_interval = 300
-        seconds_ago = 900
+        # Verify service name mapping
+        assert svc["name"] == "syncthing", "Container name should be 'syncthing'"
+        assert svc["service_name"] == "syncthing", "Service name should be 'syncthing'"
         
-        assert seconds_ago > expected_interval * 2, f"{seconds_ago}s should be > {expected_interval * 2}s for red"
-    
-    def test_librarian_41s_should_be_green(self):
-        """Test librarian at 41s should show green (41 <= 60)."""
-        expected_interval = 60
-        seconds_ago = 41
+        # Verify expected interval lookup
+        expected_interval = service_max_interval(svc.get("service_name"))
         
-        assert seconds_ago <= expected_interval, f"{seconds_ago}s should be <= {expected_interval}s for green"
+        assert expected_interval == 300, f"Expected 300s interval for syncthing, got {expected_interval}s"
+
+
+class TestColorCodingEndToEnd:
+    """Test with mocked database values."""
     
-    def test_librarian_60s_should_be_green(self):
-        """Test librarian at 60s should show green (60 <= 60) - boundary case."""
-        expected_interval = 60
-        seconds_ago = 60
-        
+    def test_syncthing_109s_from_database_shows_green(self, db_session, syncthing_container):
+        """Test syncthing at 109s from database shows green."""
+        now = datetime.now()
+        # Mock the database query
+        db_session.execute.return_value.all.return_value = [SimpleNamespace(
+            service_name="syncthing",
+            last_heartbeat=now - timedelta(seconds=109),
+            status="OK",
+            current_task=None,
+            updated_at=now,
+        )]
+        
+        result = get_all_services_status()
+        
+        assert len(result) == 1
+        svc = result[0]
+        assert svc["heartbeat"] is not None
+        
+        # Test the color calculation using implementation logic
+        expected_interval = service_max_interval(svc.get("service_name"))
+        seconds_ago, _ = _heartbeat_age(svc["heartbeat"]["last_heartbeat"], expected_interval, now)
+        
+        # Implementation uses <= for green boundary
         assert seconds_ago <= expected_interval, f"{seconds_ago}s should be <= {expected_interval}s for green"
-    
-    def test_librarian_90s_should_be_yellow(self):
-        """Test librarian at 90s should show yellow (60 < 90 <= 120)."""
-        expected_interval = 60
-        seconds_ago = 90
+        assert seconds_ago == 109, f"Expected 109s, got {seconds_ago}s"
         
-        assert seconds_ago > expected_interval, f"{seconds_ago}s should be > {expected_interval}s"
-        assert seconds_ago <= expected_interval * 2, f"{seconds_ago}s should be <= {expected_interval * 2}s for yellow"
-    
-    def test_librarian_120s_should_be_yellow(self):
-        """Test librarian at 120s should show yellow (60 < 120 <= 120) - boundary case."""
-        expected_interval = 60
-        seconds_ago = 120
-        
-        assert seconds_ago > expected_interval, f"{seconds_ago}s should be > {expected_interval}s"
-        assert seconds_ago <= expected_interval * 2, f"{seconds_ago}s should be <= {expected_interval * 2}s for yellow"
-    
-    def test_librarian_121s_should_be_red(self):
-        """Test librarian at 121s should show red (121 > 120)."""
-        expected_interval = 60
-        seconds_ago = 121
+        # Classify with the dashboard's own helper
+        color = HEARTBEAT_ICONS[_heartbeat_level(seconds_ago, expected_interval)]
         
-        assert seconds_ago > expected_interval * 2, f"{seconds_ago}s should be > {expected_interval * 2}s for red"
+        assert color == "🟢", f"Expected green for 109s, got {color}"
 
 
-class TestColorCodingDisplay:
-    """Test the full display pipeline with mocked data."""
+class TestHeartbeatLabel:
+    """Test the shared heartbeat label helper used by every heartbeat display."""
     
-    def test_syncthing_109s_shows_green_in_status_data(self):
-        """Test that syncthing at 109s shows green in status_data table."""
-        get_all_services_status.clear()
-        
-        with patch('Src.Dashboard.dashboard.DOCKER_AVAILABLE', True):
-            with patch('Src.Dashboard.dashboard.get_available_services') as mock_services:
-                mock_services.return_value = ["syncthing"]
-                
-                with patch('Src.Dashboard.dashboard.get_container_status') as mock_container:
-                    mock_container.return_value = {"running": True, "health": "healthy"}
-                    
-                    with patch('Src.Dashboard.dashboard.get_service_heartbeat') as mock_heartbeat:
-                        # Syncthing at 109 seconds (should be green)
-                        mock_heartbeat.return_value = {
-                            "last_heartbeat": datetime.now() - timedelta(seconds=109),
-                            "status": "OK"
-                        }
-                        
-                        result = get_all_services_status()
-                        
-                        assert len(result) == 1
-                        assert result[0]["name"] == "syncthing"
-                        assert result[0]["service_name"] == "syncthing"
-                        assert result[0]["heartbeat"] is not None
-                        
-                        # Now test the display logic
-                        from Src.Dashboard.dashboard import datetime as dt_module
-                        svc = result[0]
-                        
-                        service_intervals = {
-                            "librarian": 60,
-                            "dashboard": 300,
-                            "factory-db": 300,
-                            "syncthing": 300,
-                        }
-                        
-                        service_name_for_interval = svc.get("service_name")
-                        expected_interval = service_intervals.get(service_name_for_interval, 300)
-                        
-                        time_since = datetime.now() - svc["heartbeat"]["last_heartbeat"]
-                        seconds_ago = int(time_since.total_seconds())
-                        ratio = seconds_ago / expected_interval if expected_interval > 0 else 0
-                        
-                        # Verify color based on implementation logic (uses <=)
-                        assert seconds_ago == 109, f"Expected 109s, got {seconds_ago}s"
-                        assert expected_interval == 300, f"Expected 300s interval, got {expected_interval}s"
-                        assert seconds_ago <= expected_interval, f"{seconds_ago}s should be <= {expected_interval}s for green"
-                        
-                        # Match implementation: seconds_ago <= max_interval -> green
-                        if seconds_ago <= expected_interval:
-                            color = "🟢"
-                        elif seconds_ago <= expected_interval * 2:
-                            color = "🟡"
-                        else:
-                            color = "🔴"
-                        
-                        assert color == "🟢", f"Expected green, got {color} for {seconds_ago}s"
+    @pytest.mark.parametrize("seconds_ago,max_interval,expected", [
+        (41, 60, "🟢 41s/60s ago"),
+        (60, 60, "🟢 60s/60s ago"),
+        (61, 60, "🟡 61s/60s ago"),
+        (120, 60, "🟡 120s/60s ago"),
+        (121, 60, "🔴 121s/60s ago"),
+        (300, 300, "🟢 300s/300s ago"),
+        (600, 300, "🟡 600s/300s ago"),
+        (601, 300, "🔴 601s/300s ago"),
+    ])
+    def test_label_boundaries(self, seconds_ago, max_interval, expected):
+        """Exactly at the interval is green, exactly at twice the interval is yellow."""
+        assert _heartbeat_label(seconds_ago, max_interval) == expected
     
-    def test_syncthing_350s_shows_yellow_in_status_data(self):
-        """Test that syncthing at 350s shows yellow in status_data table."""
-        get_all_services_status.clear()
+    def test_age_uses_shared_reference_time(self):
+        """Heartbeat age is measured against the rerun's `now`, not the wall clock."""
+        now = datetime(2026, 1, 1, 12, 0, 0)
         
-        with patch('Src.Dashboard.dashboard.DOCKER_AVAILABLE', True):
-            with patch('Src.Dashboard.dashboard.get_available_services') as mock_services:
-                mock_services.return_value = ["syncthing"]
-                
-                with patch('Src.Dashboard.dashboard.get_container_status') as mock_container:
-                    mock_container.return_value = {"running": True, "health": "healthy"}
-                    
-                    with patch('Src.Dashboard.dashboard.get_service_heartbeat') as mock_heartbeat:
-                        # Syncthing at 350 seconds (should be yellow)
-                        mock_heartbeat.return_value = {
-                            "last_heartbeat": datetime.now() - timedelta(seconds=350),
-                            "status": "OK"
-                        }
-                        
-                        result = get_all_services_status()
-                        
-                        svc = result[0]
-                        service_intervals = {"syncthing": 300}
-                        service_name_for_interval = svc.get("service_name")
-                        expected_interval = service_intervals.get(service_name_for_interval, 300)
-                        
-                        time_since = datetime.now() - svc["heartbeat"]["last_heartbeat"]
-                        seconds_ago = int(time_since.total_seconds())
-                        
-                        # Implementation uses: max_interval < seconds_ago <= max_interval * 2 for yellow
-                        assert seconds_ago > expected_interval, f"{seconds_ago}s should be > {expected_interval}s"
-                        assert seconds_ago <= expected_interval * 2, f"{seconds_ago}s should be <= {expected_interval * 2}s for yellow"
-                        
-                        # Match implementation logic
-                        if seconds_ago <= expected_interval:
-                            color = "🟢"
-                        elif seconds_ago <= expected_interval * 2:
-                            color = "🟡"
-                        else:
-                            color = "🔴"
-                        
-                        assert color == "🟡", f"Expected yellow, got {color} for {seconds_ago}s"
+        assert _heartbeat_age(now - timedelta(seconds=90), 60, now) == (90, 1)
+        assert _heartbeat_age(now - timedelta(seconds=30), 60, now) == (30, 0)
+
+
+class TestServicesTableColumns:
+    """Test the fused All Services table columns."""
     
-    def test_syncthing_601s_shows_red_in_status_data(self):
-        """Test that syncthing at 601s shows red in status_data table.
+    def test_columns_are_formatted_in_one_pass(self, monkeypatch):
+        """Status and task are formatted; heartbeats keep their timestamp and interval."""
+        last_heartbeat = datetime(2026, 1, 1, 12, 0, 0)
+        services = [
+            {"name": "librarian", "service_name": "librarian", "container_running": True,
+             "container_health": "healthy", "heartbeat": {"last_heartbeat": last_heartbeat, "current_task": "Idle"}},
+            {"name": "syncthing", "service_name": "syncthing", "container_running": False,
+             "container_health": "unknown", "heartbeat": None},
+        ]
         
-        Note: 600s would be yellow (600 <= 600), so we use 601s for red.
-        """
-        get_all_services_status.clear()
+        monkeypatch.setattr('Src.Dashboard.dashboard.get_all_services_status', Mock(return_value=services))
         
-        with patch('Src.Dashboard.dashboard.DOCKER_AVAILABLE', True):
-            with patch('Src.Dashboard.dashboard.get_available_services') as mock_services:
-                mock_services.return_value = ["syncthing"]
-                
-                with patch('Src.Dashboard.dashboard.get_container_status') as mock_container:
-                    mock_container.return_value = {"running": True, "health": "healthy"}
-                    
-                    with patch('Src.Dashboard.dashboard.get_service_heartbeat') as mock_heartbeat:
-                        # Syncthing at 601 seconds (should be red: 601 > 600)
-                        mock_heartbeat.return_value = {
-                            "last_heartbeat": datetime.now() - timedelta(seconds=601),
-                            "status": "OK"
-                        }
-                        
-                        result = get_all_services_status()
-                        
-                        svc = result[0]
-                        service_intervals = {"syncthing": 300}
-                        service_name_for_interval = svc.get("service_name")
-                        expected_interval = service_intervals.get(service_name_for_interval, 300)
-                        
-                        time_since = datetime.now() - svc["heartbeat"]["last_heartbeat"]
-                        seconds_ago = int(time_since.total_seconds())
-                        
-                        # Implementation: seconds_ago > max_interval * 2 is red
-                        assert seconds_ago > expected_interval * 2, f"{seconds_ago}s should be > {expected_interval * 2}s for red"
-                        
-                        # Match implementation logic
-                        if seconds_ago <= expected_interval:
-                            color = "🟢"
-                        elif seconds_ago <= expected_interval * 2:
-                            color = "🟡"
-                        else:
-                            color = "🔴"
-                        
-                        assert color == "🔴", f"Expected red, got {color} for {seconds_ago}s"
-    
-    def test_service_name_mapping_syncthing(self):
-        """Test that container name 'syncthing' correctly maps to service name 'syncthing'."""
-        get_all_services_status.clear()
+        columns, heartbeat_refs = get_services_table_columns()
         
-        with patch('Src.Dashboard.dashboard.DOCKER_AVAILABLE', True):
-            with patch('Src.Dashboard.dashboard.get_available_services') as mock_services:
-                mock_services.return_value = ["syncthing"]
-                
-                with patch('Src.Dashboard.dashboard.get_container_status') as mock_container:
-                    mock_container.return_value = {"running": True, "health": "healthy"}
-                    
-                    with patch('Src.Dashboard.dashboard.get_service_heartbeat') as mock_heartbeat:
-                        mock_heartbeat.return_value = {
-                            "last_heartbeat": datetime.now() - timedelta(seconds=109),
-                            "status": "OK"
-                        }
-                        
-                        result = get_all_services_status()
-                        
-                        assert len(result) == 1
-                        svc = result[0]
-                        
-                        # Verify service name mapping
-                        assert svc["name"] == "syncthing", "Container name should be 'syncthing'"
-                        assert svc["service_name"] == "syncthing", "Service name should be 'syncthing'"
-                        
-                        # Verify expected interval lookup
-                        service_intervals = {"syncthing": 300}
-                        service_name_for_interval = svc.get("service_name")
-                        expected_interval = service_intervals.get(service_name_for_interval, 300)
-                        
-                        assert expected_interval == 300, f"Expected 300s interval for syncthing, got {expected_interval}s"
-
-
-class TestColorCodingEndToEnd:
-    """Test with mocked database values."""
+        assert columns == {
+            "Service": ["librarian", "syncthing"],
+            "Status": ["🟢 Healthy", "🔴 Not Running"],
+            "Current Task": ["Idle", "N/A"],
+        }
+        assert heartbeat_refs == [(last_heartbeat, 60), (None, 300)]
     
-    def test_syncthing_109s_from_database_shows_green(self):
-        """Test syncthing at 109s from database shows green."""
-        get_all_services_status.clear()
-        get_service_heartbeat.clear()
+    def test_status_reads_are_not_cached_below_the_table(self, db_session, syncthing_container):
+        """Only the table is cached: each status read below it queries the heartbeats afresh."""
+        db_session.execute.return_value.all.return_value = []
         
-        with patch('Src.Dashboard.dashboard.DOCKER_AVAILABLE', True):
-            with patch('Src.Dashboard.dashboard.get_available_services') as mock_services:
-                mock_services.return_value = ["syncthing"]
-                
-                with patch('Src.Dashboard.dashboard.get_container_status') as mock_container:
-                    mock_container.return_value = {"running": True, "health": "healthy"}
-                    
-                    # Mock the database query
-                    with patch('Src.Dashboard.dashboard.get_db_session') as mock_db:
-                        mock_status = Mock()
-                        mock_status.service_name = "syncthing"
-                        mock_status.last_heartbeat = datetime.now() - timedelta(seconds=109)
-                        mock_status.status = "OK"
-                        mock_status.current_task = None
-                        mock_status.updated_at = datetime.now()
-                        
-                        mock_session = Mock()
-                        mock_session.__enter__ = Mock(return_value=mock_session)
-                        mock_session.__exit__ = Mock(return_value=None)
-                        mock_session.query.return_value.filter.return_value.first.return_value = mock_status
-                        mock_db.return_value = mock_session
-                        
-                        result = get_all_services_status()
-                        
-                        assert len(result) == 1
-                        svc = result[0]
-                        assert svc["heartbeat"] is not None
-                        
-                        # Test the color calculation using implementation logic
-                        service_intervals = {"syncthing": 300}
-                        service_name_for_interval = svc.get("service_name")
-                        expected_interval = service_intervals.get(service_name_for_interval, 300)
-                        
-                        time_since = datetime.now() - svc["heartbeat"]["last_heartbeat"]
-                        seconds_ago = int(time_since.total_seconds())
-                        
-                        # Implementation uses <= for green boundary
-                        assert seconds_ago <= expected_interval, f"{seconds_ago}s should be <= {expected_interval}s for green"
-                        assert seconds_ago == 109, f"Expected 109s, got {seconds_ago}s"
-                        
-                        # Match implementation logic
-                        if seconds_ago <= expected_interval:
-                            color = "🟢"
-                        elif seconds_ago <= expected_interval * 2:
-                            color = "🟡"
-                        else:
-                            color = "🔴"
-                        
-                        assert color == "🟢", f"Expected green for 109s, got {color}"
-
-
-
-
-
-
-
-
-
-
+        get_all_services_status()
+        get_all_services_status()
+        
+        assert db_session.execute.call_count == 2
@@ -3,114 +3,78 @@ Tests to ensure dashboard data is fresh and not stale.
 
 This test suite prevents issues like stale heartbeat data being displayed.
 """
+import pickle
+import sys
+
 import pytest
 from datetime import datetime, timedelta
-from unittest.mock import Mock, patch
+from types import ModuleType, SimpleNamespace
+from unittest.mock import patch
 
 from Src.Dashboard.dashboard import (
-    get_librarian_heartbeat,
+    _heartbeat_age,
+    dashboard_snapshot,
     get_service_heartbeat,
-    get_total_assets,
-    get_assets_last_hour,
+    refresh_overview_snapshot,
 )
 
 
 class TestHeartbeatDataFreshness:
     """Test that heartbeat data is always fresh and correctly calculated."""
     
-    def test_heartbeat_time_calculation_is_fresh(self):
+    def test_heartbeat_time_calculation_is_fresh(self, db_session):
         """
         Test that heartbeat time calculation uses current time, not stale timestamps.
         
         This prevents the issue where preserving old heartbeat timestamps
         and calculating time_since from current time makes it look stale.
         """
+        # One reference time for the whole test, as the dashboard uses per rerun
+        now = datetime.now()
         # Create a mock heartbeat record with a recent timestamp
-        recent_heartbeat = datetime.now() - timedelta(seconds=30)
-        
-        with patch('Src.Dashboard.dashboard.get_db_session') as mock_session:
-            # Mock the database session
-            mock_status = Mock()
-            mock_status.last_heartbeat = recent_heartbeat
-            mock_status.status = "OK"
-            mock_status.current_task = None
-            mock_status.updated_at = datetime.now()
-            
-            mock_query = Mock()
-            mock_query.filter.return_value.first.return_value = mock_status
-            
-            mock_session_obj = Mock()
-            mock_session_obj.__enter__ = Mock(return_value=mock_session_obj)
-            mock_session_obj.__exit__ = Mock(return_value=False)
-            mock_session_obj.query.return_value = mock_query
-            mock_session.return_value = mock_session_obj
-            
-            # Get heartbeat
-            result = get_librarian_heartbeat()
-            
-            # Verify result contains the heartbeat timestamp
-            assert result is not None
-            assert "last_heartbeat" in result
-            assert result["last_heartbeat"] == recent_heartbeat
-            
-            # Verify time calculation would be fresh (not stale)
-            time_since = datetime.now() - result["last_heartbeat"]
-            seconds_ago = int(time_since.total_seconds())
-            
-            # Should be around 30 seconds (with some tolerance for test execution time)
-            assert 25 <= seconds_ago <= 35, f"Expected ~30s ago, got {seconds_ago}s"
+        recent_heartbeat = now - timedelta(seconds=30)
+        # Overview row: total, last hour, then the LEFT JOINed librarian status
+        db_session.execute.return_value.one.return_value = (10, False, 1, recent_heartbeat, "OK", None, now)
+        db_session.execute.return_value.all.return_value = []
+        
+        # Get heartbeat
+        result = dashboard_snapshot(now=now)[0].librarian_heartbeat
+        
+        # Verify result contains the heartbeat timestamp
+        assert result is not None
+        assert "last_heartbeat" in result
+        assert result["last_heartbeat"] == recent_heartbeat
+        
+        # Verify time calculation would be fresh (not stale)
+        seconds_ago, _ = _heartbeat_age(result["last_heartbeat"], 60, now)
+        
+        assert seconds_ago == 30, f"Expected 30s ago, got {seconds_ago}s"
     
-    def test_heartbeat_returns_none_when_no_data(self):
+    def test_heartbeat_returns_none_when_no_data(self, db_session):
         """Test that heartbeat returns None when no data exists."""
-        # Clear cache to ensure fresh test
-        get_librarian_heartbeat.clear()
+        # No librarian status row: the LEFT JOIN leaves its columns NULL
+        db_session.execute.return_value.one.return_value = (0, False, 0, None, None, None, None)
+        db_session.execute.return_value.all.return_value = []
         
-        with patch('Src.Dashboard.dashboard.get_db_session') as mock_session:
-            # Mock the query chain: query(SystemStatus).filter().first() returns None
-            mock_query_result = Mock()
-            mock_query_result.first.return_value = None
-            
-            mock_query = Mock()
-            mock_query.filter.return_value = mock_query_result
-            
-            mock_session_obj = Mock()
-            mock_session_obj.__enter__ = Mock(return_value=mock_session_obj)
-            mock_session_obj.__exit__ = Mock(return_value=False)
-            mock_session_obj.query.return_value = mock_query
-            mock_session.return_value = mock_session_obj
-            
-            result = get_librarian_heartbeat()
-            assert result is None
+        result = dashboard_snapshot()[0].librarian_heartbeat
+        assert result is None
     
-    def test_service_heartbeat_uses_fresh_timestamp(self):
+    def test_service_heartbeat_uses_fresh_timestamp(self, db_session):
         """Test that service heartbeat calculation uses current time."""
-        recent_heartbeat = datetime.now() - timedelta(seconds=45)
-        
-        with patch('Src.Dashboard.dashboard.get_db_session') as mock_session:
-            mock_status = Mock()
-            mock_status.last_heartbeat = recent_heartbeat
-            mock_status.status = "OK"
-            mock_status.current_task = "processing"
-            mock_status.updated_at = datetime.now()
-            
-            mock_query = Mock()
-            mock_query.filter.return_value.first.return_value = mock_status
-            
-            mock_session_obj = Mock()
-            mock_session_obj.__enter__ = Mock(return_value=mock_session_obj)
-            mock_session_obj.__exit__ = Mock(return_value=False)
-            mock_session_obj.query.return_value = mock_query
-            mock_session.return_value = mock_session_obj
-            
-            result = get_service_heartbeat("test_service")
-            
-            assert result is not None
-            assert result["last_heartbeat"] == recent_heartbeat
-            
-            # Verify time calculation is fresh
-            time_since = datetime.now() - result["last_heartbeat"]
-            seconds_ago = int(time_since.total_seconds())
-            assert 40 <= seconds_ago <= 50, f"Expected ~45s ago, got {seconds_ago}s"
+        now = datetime.now()
+        recent_heartbeat = now - timedelta(seconds=45)
+        db_session.execute.return_value.first.return_value = SimpleNamespace(
+            last_heartbeat=recent_heartbeat, status="OK", current_task="processing", updated_at=now
+        )
+        
+        result = get_service_heartbeat("test_service")
+        
+        assert result is not None
+        assert result["last_heartbeat"] == recent_heartbeat
+        
+        # Verify time calculation is fresh
+        seconds_ago, _ = _heartbeat_age(result["last_heartbeat"], 300, now)
+        assert seconds_ago == 45, f"Expected 45s ago, got {seconds_ago}s"
 
 
 class TestDataNotStale:
@@ -126,7 +90,7 @@ class TestDataNotStale:
         from Src.Dashboard import dashboard
         
         # Check that heartbeat functions have short TTL
-        heartbeat_func = dashboard.get_librarian_heartbeat
+        heartbeat_func = dashboard.dashboard_snapshot
         if hasattr(heartbeat_func, 'cache_ttl'):
             # If using st.cache_data with TTL, verify it's short
             ttl = heartbeat_func.cache_ttl
@@ -140,16 +104,89 @@ class TestDataNotStale:
         is calculated incorrectly, making it look like 95s ago when it should be 5s.
         """
         # Simulate a heartbeat that was updated 5 seconds ago
-        heartbeat_time = datetime.now() - timedelta(seconds=5)
+        now = datetime.now()
+        heartbeat_time = now - timedelta(seconds=5)
         
         # Calculate time since (this is what the dashboard does)
-        time_since = datetime.now() - heartbeat_time
-        seconds_ago = int(time_since.total_seconds())
+        seconds_ago, _ = _heartbeat_age(heartbeat_time, 60, now)
         
-        # Should be around 5 seconds (with tolerance)
-        assert 3 <= seconds_ago <= 7, f"Expected ~5s ago, got {seconds_ago}s - this indicates stale data calculation"
+        assert seconds_ago == 5, f"Expected 5s ago, got {seconds_ago}s - this indicates stale data calculation"
         
         # Verify this doesn't become stale over time
         # (In real code, this calculation happens every render, so it's always fresh)
         assert seconds_ago < 10, "Heartbeat should never show >10s if calculated fresh"
+    
+    def test_last_hour_count_cached_within_same_minute(self, db_session):
+        """Test that minute-bucketed reference times reuse the cached last-hour count."""
+        from Src.Dashboard import dashboard
+        
+        db_session.execute.return_value.one.return_value = (10, False, 3, None, None, None, None)
+        db_session.execute.return_value.all.return_value = []
+        
+        minute = datetime(2024, 5, 1, 12, 30)
+        assert dashboard_snapshot(now=minute)[0].assets_last_hour == 3
+        assert dashboard_snapshot(now=minute)[0].assets_last_hour == 3
+        
+        # Second call within the same minute bucket is served from cache
+        assert dashboard.get_db_session.call_count == 1
+    
+    def test_snapshot_pickles_under_a_fresh_main_module(self, db_session, monkeypatch):
+        """
+        Test that the cached snapshot still pickles after Streamlit swaps in a new __main__.
+        
+        Streamlit runs dashboard.py as a fresh, empty __main__ module on every
+        rerun (fragment ticks included), and st.cache_data pickles return
+        values, so they may only hold classes from importable modules.
+        """
+        db_session.execute.return_value.one.return_value = (10, False, 3, None, None, None, None)
+        db_session.execute.return_value.all.return_value = []
+        monkeypatch.setitem(sys.modules, "__main__", ModuleType("__main__"))
+        
+        stats, recent_assets = pickle.loads(pickle.dumps(dashboard_snapshot()))
+        
+        assert stats.assets_last_hour == 3
+        assert recent_assets == []
+        # Not defined in the script Streamlit runs as __main__
+        assert type(stats).__module__ == "Src.Dashboard.stats"
+
 
+class TestOverviewVersionStamp:
+    """Test that the overview snapshot is only rebuilt when its data changes."""
+    
+    def test_snapshot_reused_while_version_unchanged(self):
+        """Test that an unchanged data version reuses the previous snapshot."""
+        now = datetime(2024, 1, 1, 12, 30)
+        version = (datetime(2024, 1, 1, 12, 29), datetime(2024, 1, 1, 12, 28))
+        
+        with patch('Src.Dashboard.dashboard.get_data_version', return_value=version), \
+             patch('Src.Dashboard.dashboard.dashboard_snapshot') as mock_snapshot:
+            mock_snapshot.return_value = ("stats", [])
+            
+            first = refresh_overview_snapshot(None, now)
+            second = refresh_overview_snapshot(first, now)
+            
+            assert second is first
+            assert mock_snapshot.call_count == 1
+    
+    def test_snapshot_rebuilt_on_new_version_or_minute(self):
+        """Test that new data or a new minute bucket rebuilds the snapshot."""
+        now = datetime(2024, 1, 1, 12, 30)
+        old_version = (datetime(2024, 1, 1, 12, 29), datetime(2024, 1, 1, 12, 28))
+        new_version = (datetime(2024, 1, 1, 12, 29), datetime(2024, 1, 1, 12, 30))
+        previous = ((old_version, now), ("stale", []))
+        
+        with patch('Src.Dashboard.dashboard.dashboard_snapshot', return_value=("fresh", [])) as mock_snapshot:
+            with patch('Src.Dashboard.dashboard.get_data_version', return_value=new_version):
+                assert refresh_overview_snapshot(previous, now)[1] == ("fresh", [])
+            with patch('Src.Dashboard.dashboard.get_data_version', return_value=old_version):
+                assert refresh_overview_snapshot(previous, now + timedelta(minutes=1))[1] == ("fresh", [])
+            assert mock_snapshot.call_count == 2
+    
+    def test_snapshot_rebuilt_when_version_unknown(self):
+        """Test that a failed version lookup never counts as unchanged."""
+        now = datetime(2024, 1, 1, 12, 30)
+        previous = ((None, now), ("stale", []))
+        
+        with patch('Src.Dashboard.dashboard.get_data_version', return_value=None), \
+             patch('Src.Dashboard.dashboard.dashboard_snapshot', return_value=("fresh", [])):
+            assert refresh_overview_snapshot(previous, now)[1] == ("fresh", [])
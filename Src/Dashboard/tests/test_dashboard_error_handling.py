@@ -4,19 +4,20 @@ Tests for dashboard error handling and edge cases.
 Ensures the dashboard gracefully handles failures (Docker unavailable, DB unavailable, etc.)
 """
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import patch, MagicMock
 from datetime import datetime
+from types import SimpleNamespace
 
 from Src.Dashboard.dashboard import (
     get_container_status,
-    get_librarian_heartbeat,
-    get_total_assets,
-    get_assets_last_hour,
-    get_recent_assets,
     get_service_heartbeat,
     get_available_services,
-    get_service_logs,
+    get_incremental_service_logs,
     get_all_services_status,
+    dashboard_snapshot,
+    DashboardStats,
+    is_database_connected,
+    ContainerPoller,
     DOCKER_AVAILABLE,
 )
 
@@ -39,17 +40,14 @@ class TestDockerUnavailable:
             assert len(result) > 0
             assert "librarian" in result or "dashboard" in result
     
-    def test_get_service_logs_returns_empty_when_docker_unavailable(self):
-        """Test that get_service_logs returns empty string when Docker unavailable."""
+    def test_get_incremental_service_logs_returns_empty_when_docker_unavailable(self):
+        """Test that get_incremental_service_logs returns empty string when Docker unavailable."""
         with patch('Src.Dashboard.dashboard.DOCKER_AVAILABLE', False):
-            result = get_service_logs("test_service")
+            result = get_incremental_service_logs("test_service")
             assert result == ""
     
     def test_get_all_services_status_returns_empty_when_docker_unavailable(self):
         """Test that get_all_services_status returns empty list when Docker unavailable."""
-        get_all_services_status.clear()
-        get_available_services.clear()
-        
         with patch('Src.Dashboard.dashboard.DOCKER_AVAILABLE', False):
             with patch('Src.Dashboard.dashboard.get_available_services') as mock_services:
                 mock_services.return_value = []  # No services when Docker unavailable
@@ -60,50 +58,46 @@ class TestDockerUnavailable:
 class TestDatabaseUnavailable:
     """Test dashboard behavior when database is unavailable."""
     
-    def test_get_librarian_heartbeat_handles_db_error(self):
-        """Test that get_librarian_heartbeat handles database errors gracefully."""
-        get_librarian_heartbeat.clear()
-        
+    def test_get_service_heartbeat_handles_db_error(self):
+        """Test that get_service_heartbeat handles database errors gracefully."""
         with patch('Src.Dashboard.dashboard.get_db_session') as mock_session:
             # Simulate database error
             mock_session.side_effect = Exception("Database connection failed")
             
-            result = get_librarian_heartbeat()
+            result = get_service_heartbeat("librarian")
             # Should return None on error, not crash
             assert result is None
     
-    def test_get_total_assets_returns_zero_on_db_error(self):
-        """Test that get_total_assets returns 0 on database error."""
-        get_total_assets.clear()
-        
+    def test_dashboard_snapshot_returns_defaults_on_db_error(self):
+        """Test that dashboard_snapshot returns zeroed stats and no recent assets on database error."""
         with patch('Src.Dashboard.dashboard.get_db_session') as mock_session:
             mock_session.side_effect = Exception("Database connection failed")
             
-            result = get_total_assets()
-            # Should return 0 on error, not crash
-            assert result == 0
+            result = dashboard_snapshot()
+            # Should return (stats, recent) defaults, not crash
+            assert result == (DashboardStats(total_assets=0, assets_last_hour=0, librarian_heartbeat=None), [])
     
-    def test_get_assets_last_hour_returns_zero_on_db_error(self):
-        """Test that get_assets_last_hour returns 0 on database error."""
-        get_assets_last_hour.clear()
+    def test_failed_db_probe_opens_circuit(self):
+        """Test that a failed DB probe skips further probes until the backoff expires."""
+        session_state = {}
         
-        with patch('Src.Dashboard.dashboard.get_db_session') as mock_session:
-            mock_session.side_effect = Exception("Database connection failed")
+        with patch('Src.Dashboard.dashboard.st.session_state', session_state), \
+             patch('Src.Dashboard.dashboard.get_database_health', return_value=False) as mock_health:
+            assert is_database_connected() is False
+            assert is_database_connected() is False
             
-            result = get_assets_last_hour()
-            # Should return 0 on error, not crash
-            assert result == 0
+            # Second call short-circuits without probing
+            assert mock_health.call_count == 1
+            assert "db_next_probe_at" in session_state
     
-    def test_get_recent_assets_returns_empty_list_on_db_error(self):
-        """Test that get_recent_assets returns empty list on database error."""
-        get_recent_assets.clear()
+    def test_successful_db_probe_closes_circuit(self):
+        """Test that a successful DB probe clears the circuit breaker."""
+        session_state = {"db_next_probe_at": datetime(2000, 1, 1)}
         
-        with patch('Src.Dashboard.dashboard.get_db_session') as mock_session:
-            mock_session.side_effect = Exception("Database connection failed")
-            
-            result = get_recent_assets()
-            # Should return empty list on error, not crash
-            assert result == []
+        with patch('Src.Dashboard.dashboard.st.session_state', session_state), \
+             patch('Src.Dashboard.dashboard.get_database_health', return_value=True):
+            assert is_database_connected() is True
+            assert "db_next_probe_at" not in session_state
 
 
 class TestDockerErrors:
@@ -114,9 +108,9 @@ class TestDockerErrors:
         if not DOCKER_AVAILABLE:
             pytest.skip("Docker not available in test environment")
         
-        with patch('Src.Dashboard.dashboard.docker_client') as mock_client:
-            from docker.errors import NotFound
-            mock_client.containers.get.side_effect = NotFound("Container not found")
+        with patch('Src.Dashboard.dashboard.docker_client') as mock_client, \
+             patch('Src.Dashboard.dashboard._get_container_poller', return_value=ContainerPoller()):
+            mock_client.api.containers.return_value = []
             
             result = get_container_status("nonexistent_container")
             # Should return dict with not_found status, not crash
@@ -129,104 +123,76 @@ class TestDockerErrors:
         if not DOCKER_AVAILABLE:
             pytest.skip("Docker not available in test environment")
         
-        with patch('Src.Dashboard.dashboard.docker_client') as mock_client:
-            mock_client.containers.get.side_effect = Exception("Docker API error")
+        with patch('Src.Dashboard.dashboard.docker_client') as mock_client, \
+             patch('Src.Dashboard.dashboard._get_container_poller', return_value=ContainerPoller()):
+            mock_client.api.containers.side_effect = Exception("Docker API error")
             
             result = get_container_status("test_container")
             # Should return None on error, not crash
             assert result is None
     
-    def test_get_service_logs_handles_not_found(self):
-        """Test that get_service_logs handles container not found."""
-        get_service_logs.clear()
-        
+    def test_get_incremental_service_logs_handles_not_found(self):
+        """Test that get_incremental_service_logs handles container not found."""
         if not DOCKER_AVAILABLE:
             pytest.skip("Docker not available in test environment")
         
-        with patch('Src.Dashboard.dashboard.docker_client') as mock_client:
+        with patch('Src.Dashboard.dashboard.docker_client') as mock_client, \
+             patch('Src.Dashboard.dashboard.st.session_state', {}):
             from docker.errors import NotFound
-            mock_container = Mock()
-            mock_client.containers.get.side_effect = NotFound("Container not found")
+            mock_client.api.logs.side_effect = NotFound("Container not found")
             
-            result = get_service_logs("nonexistent_service")
+            result = get_incremental_service_logs("nonexistent_service")
             # Should return error message, not crash
             assert isinstance(result, str)
             assert "not found" in result.lower() or result == ""
     
-    def test_get_service_logs_handles_generic_error(self):
-        """Test that get_service_logs handles generic errors."""
-        get_service_logs.clear()
-        
+    def test_get_incremental_service_logs_handles_generic_error(self):
+        """Test that get_incremental_service_logs handles generic errors."""
         if not DOCKER_AVAILABLE:
             pytest.skip("Docker not available in test environment")
         
-        with patch('Src.Dashboard.dashboard.docker_client') as mock_client:
-            mock_client.containers.get.side_effect = Exception("Docker API error")
+        with patch('Src.Dashboard.dashboard.docker_client') as mock_client, \
+             patch('Src.Dashboard.dashboard.st.session_state', {}):
+            mock_client.api.logs.side_effect = Exception("Docker API error")
             
-            result = get_service_logs("test_service")
-            # Should return empty string on error, not crash
-            assert result == ""
+            result = get_incremental_service_logs("test_service")
+            # Should return an error note for the log pane, not crash
+            assert result == "[Error fetching logs from test_service: Docker API error]"
 
 
 class TestEdgeCases:
     """Test edge cases and boundary conditions."""
     
-    def test_get_recent_assets_with_limit(self):
-        """Test that get_recent_assets respects the limit parameter."""
-        get_recent_assets.clear()
+    def test_recent_assets_with_limit(self, db_session):
+        """Test that dashboard_snapshot respects the recent_limit parameter."""
+        # Mock multiple asset rows (as returned by Result.all())
+        mock_rows = [
+            (f"file_{i}.jpg", 1000, datetime.now(), datetime.now(), f"/path/to/file_{i}.jpg")
+            for i in range(10)
+        ]
+        db_session.execute.return_value.one.return_value = (10, False, 0, None, None, None, None)
+        db_session.execute.return_value.all.return_value = mock_rows
         
-        with patch('Src.Dashboard.dashboard.get_db_session') as mock_session:
-            # Mock multiple assets
-            mock_assets = [Mock() for _ in range(20)]
-            for i, asset in enumerate(mock_assets):
-                asset.id = f"id_{i}"
-                asset.original_name = f"file_{i}.jpg"
-                asset.final_path = f"/path/to/file_{i}.jpg"
-                asset.captured_at = datetime.now()
-                asset.ingested_at = datetime.now()
-                asset.size_bytes = 1000
-            
-            mock_query = Mock()
-            mock_query.order_by.return_value.limit.return_value.all.return_value = mock_assets
-            
-            mock_session_obj = Mock()
-            mock_session_obj.__enter__ = Mock(return_value=mock_session_obj)
-            mock_session_obj.__exit__ = Mock(return_value=False)
-            mock_session_obj.query.return_value = mock_query
-            mock_session.return_value = mock_session_obj
-            
-            result = get_recent_assets(limit=10)
-            # Should return list of dicts
-            assert isinstance(result, list)
-            # Note: The actual limit is enforced by SQL, but we verify it's callable
+        _, result = dashboard_snapshot(recent_limit=10)
+        # Should return list of RECENT_ASSET_COLUMNS tuples
+        assert isinstance(result, list)
+        assert len(result) == 10
+        assert result[0] == mock_rows[0]
+        # Note: The actual limit is enforced by SQL, but we verify it's callable
     
-    def test_get_service_heartbeat_with_different_service_names(self):
+    def test_get_service_heartbeat_with_different_service_names(self, db_session):
         """Test that get_service_heartbeat handles different service name formats."""
-        get_service_heartbeat.clear()
+        db_session.execute.return_value.first.return_value = SimpleNamespace(
+            last_heartbeat=datetime.now(), status="OK", current_task=None, updated_at=datetime.now()
+        )
         
-        with patch('Src.Dashboard.dashboard.get_db_session') as mock_session:
-            mock_status = Mock()
-            mock_status.last_heartbeat = datetime.now()
-            mock_status.status = "OK"
-            mock_status.current_task = None
-            mock_status.updated_at = datetime.now()
-            
-            mock_query = Mock()
-            mock_query.filter.return_value.first.return_value = mock_status
-            
-            mock_session_obj = Mock()
-            mock_session_obj.__enter__ = Mock(return_value=mock_session_obj)
-            mock_session_obj.__exit__ = Mock(return_value=False)
-            mock_session_obj.query.return_value = mock_query
-            mock_session.return_value = mock_session_obj
-            
-            # Test with different service name formats
-            result1 = get_service_heartbeat("librarian")
-            result2 = get_service_heartbeat("factory-db")
-            result3 = get_service_heartbeat("factory_postgres")
-            
-            # All should work without crashing
-            assert result1 is not None or result1 is None  # Either is valid
-            assert result2 is not None or result2 is None
-            assert result3 is not None or result3 is None
+        # Test with different service name formats
+        result1 = get_service_heartbeat("librarian")
+        result2 = get_service_heartbeat("factory-db")
+        result3 = get_service_heartbeat("factory_postgres")
+        
+        # All should work without crashing
+        assert result1 is not None or result1 is None  # Either is valid
+        assert result2 is not None or result2 is None
+        assert result3 is not None or result3 is None
 
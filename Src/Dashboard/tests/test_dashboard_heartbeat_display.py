@@ -7,7 +7,7 @@ import pytest
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch
 
-from Src.Dashboard.dashboard import get_all_services_status, get_service_heartbeat
+from Src.Dashboard.dashboard import SERVICE_MAX_INTERVALS, get_all_services_status, get_service_heartbeat
 
 
 class TestHeartbeatDisplayFormat:
@@ -15,8 +15,6 @@ class TestHeartbeatDisplayFormat:
     
     def test_librarian_heartbeat_shows_ratio_format(self):
         """Test that librarian heartbeat shows elapsed/expected format."""
-        get_all_services_status.clear()
-        
         with patch('Src.Dashboard.dashboard.DOCKER_AVAILABLE', True):
             with patch('Src.Dashboard.dashboard.get_available_services') as mock_services:
                 mock_services.return_value = ["librarian"]
@@ -24,12 +22,13 @@ class TestHeartbeatDisplayFormat:
                 with patch('Src.Dashboard.dashboard.get_container_status') as mock_container:
                     mock_container.return_value = {"running": True, "health": "healthy"}
                     
-                    with patch('Src.Dashboard.dashboard.get_service_heartbeat') as mock_heartbeat:
+                    with patch('Src.Dashboard.dashboard.get_heartbeats_for') as mock_heartbeats:
                         # Librarian at 41 seconds (within 60s interval)
-                        mock_heartbeat.return_value = {
+                        heartbeat = {
                             "last_heartbeat": datetime.now() - timedelta(seconds=41),
                             "status": "OK"
                         }
+                        mock_heartbeats.return_value = {"librarian": heartbeat}
                         
                         result = get_all_services_status()
                         
@@ -42,8 +41,6 @@ class TestHeartbeatDisplayFormat:
     
     def test_syncthing_heartbeat_shows_ratio_format(self):
         """Test that syncthing heartbeat shows elapsed/expected format."""
-        get_all_services_status.clear()
-        
         with patch('Src.Dashboard.dashboard.DOCKER_AVAILABLE', True):
             with patch('Src.Dashboard.dashboard.get_available_services') as mock_services:
                 mock_services.return_value = ["syncthing"]
@@ -51,12 +48,13 @@ class TestHeartbeatDisplayFormat:
                 with patch('Src.Dashboard.dashboard.get_container_status') as mock_container:
                     mock_container.return_value = {"running": True, "health": "healthy"}
                     
-                    with patch('Src.Dashboard.dashboard.get_service_heartbeat') as mock_heartbeat:
+                    with patch('Src.Dashboard.dashboard.get_heartbeats_for') as mock_heartbeats:
                         # Syncthing at 187 seconds (within 300s interval)
-                        mock_heartbeat.return_value = {
+                        heartbeat = {
                             "last_heartbeat": datetime.now() - timedelta(seconds=187),
                             "status": "OK"
                         }
+                        mock_heartbeats.return_value = {"syncthing": heartbeat}
                         
                         result = get_all_services_status()
                         
@@ -110,12 +108,8 @@ class TestHeartbeatDisplayFormat:
     
     def test_different_services_have_different_intervals(self):
         """Test that different services use their correct expected intervals."""
-        service_intervals = {
-            "librarian": 60,
-            "dashboard": 300,
-            "factory-db": 300,
-            "syncthing": 300,
-        }
+        # Checked against the dashboard's own interval table
+        service_intervals = SERVICE_MAX_INTERVALS
         
         # Librarian at 50s should be green (50 <= 60)
         assert 50 <= service_intervals["librarian"], "Librarian at 50s should be green"
@@ -4,15 +4,24 @@ Integration tests for Dashboard service.
 Tests the dashboard's integration with other services (Database, Docker, Librarian).
 """
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, MagicMock
 
 from Src.Dashboard.dashboard import (
-    get_librarian_heartbeat,
-    get_total_assets,
+    _run_with_script_ctx,
+    _query_dashboard_stats,
     get_all_services_status,
     get_available_services,
     get_service_heartbeat,
+    get_container_status,
+    dashboard_snapshot,
+    get_heartbeats_for,
+    _stream_log_lines,
+    get_all_logs,
+    get_incremental_service_logs,
+    ContainerPoller,
     DOCKER_AVAILABLE,
 )
 
@@ -20,57 +29,102 @@ from Src.Dashboard.dashboard import (
 class TestDashboardDatabaseIntegration:
     """Test dashboard integration with the database."""
     
-    def test_dashboard_reads_librarian_heartbeat_from_db(self):
+    def test_dashboard_reads_librarian_heartbeat_from_db(self, db_session):
         """Test that dashboard can read librarian heartbeat from database."""
-        get_librarian_heartbeat.clear()
-        
         # Create a mock heartbeat record
         recent_heartbeat = datetime.now() - timedelta(seconds=30)
+        db_session.execute.return_value.first.return_value = SimpleNamespace(
+            last_heartbeat=recent_heartbeat, status="OK", current_task="processing files", updated_at=datetime.now()
+        )
         
-        with patch('Src.Dashboard.dashboard.get_db_session') as mock_session:
-            mock_status = Mock()
-            mock_status.last_heartbeat = recent_heartbeat
-            mock_status.status = "OK"
-            mock_status.current_task = "processing files"
-            mock_status.updated_at = datetime.now()
-            
-            mock_query = Mock()
-            mock_query.filter.return_value.first.return_value = mock_status
-            
-            mock_session_obj = Mock()
-            mock_session_obj.__enter__ = Mock(return_value=mock_session_obj)
-            mock_session_obj.__exit__ = Mock(return_value=False)
-            mock_session_obj.query.return_value = mock_query
-            mock_session.return_value = mock_session_obj
-            
-            result = get_librarian_heartbeat()
-            
-            # Verify dashboard can read heartbeat data
-            assert result is not None
-            assert result["status"] == "OK"
-            assert result["current_task"] == "processing files"
-            assert result["last_heartbeat"] == recent_heartbeat
+        result = get_service_heartbeat("librarian")
+        
+        # Verify dashboard can read heartbeat data
+        assert result is not None
+        assert result["status"] == "OK"
+        assert result["current_task"] == "processing files"
+        assert result["last_heartbeat"] == recent_heartbeat
     
-    def test_dashboard_reads_asset_counts_from_db(self):
+    def test_dashboard_reads_asset_counts_from_db(self, db_session):
         """Test that dashboard can read asset counts from database."""
-        get_total_assets.clear()
+        db_session.execute.return_value.one.return_value = (42, False, 0, None, None, None, None)
+        db_session.execute.return_value.all.return_value = []
         
-        with patch('Src.Dashboard.dashboard.get_db_session') as mock_session:
-            from sqlalchemy import func
-            
-            mock_query = Mock()
-            mock_query.scalar.return_value = 42
-            
-            mock_session_obj = Mock()
-            mock_session_obj.__enter__ = Mock(return_value=mock_session_obj)
-            mock_session_obj.__exit__ = Mock(return_value=False)
-            mock_session_obj.query.return_value = mock_query
-            mock_session.return_value = mock_session_obj
-            
-            result = get_total_assets()
-            
-            # Verify dashboard can read asset count
-            assert result == 42
+        stats, recent_assets = dashboard_snapshot()
+        
+        # Verify dashboard can read asset count
+        assert stats.total_assets == 42
+        assert recent_assets == []
+    
+    def test_dashboard_reads_combined_stats_in_one_session(self, db_session):
+        """Test that dashboard_snapshot reads counts and heartbeat in one SELECT."""
+        from Src.Dashboard import dashboard
+        
+        recent_heartbeat = datetime.now() - timedelta(seconds=30)
+        db_session.execute.return_value.one.return_value = (42, False, 7, recent_heartbeat, "OK", "idle", datetime.now())
+        db_session.execute.return_value.all.return_value = []
+        
+        stats, _ = dashboard_snapshot()
+        
+        # One read-only session; one SELECT for counts + heartbeat, one for recent assets
+        dashboard.get_db_session.assert_called_once_with(readonly=True)
+        assert db_session.execute.call_count == 2
+        db_session.query.assert_not_called()
+        assert stats.total_assets == 42
+        assert stats.assets_last_hour == 7
+        assert stats.librarian_heartbeat["last_heartbeat"] == recent_heartbeat
+        assert stats.librarian_heartbeat["current_task"] == "idle"
+    
+    def test_dashboard_stats_without_librarian_heartbeat(self):
+        """Test that a missing librarian status row yields no heartbeat."""
+        session = MagicMock()
+        session.execute.return_value.one.return_value = (3, False, 0, None, None, None, None)
+        
+        result = _query_dashboard_stats(session)
+        
+        assert result.total_assets == 3
+        assert result.librarian_heartbeat is None
+    
+    def test_large_table_total_uses_planner_estimate(self):
+        """Test that a large media_assets table reports the pg_class estimate instead of COUNT(*)."""
+        session = MagicMock()
+        session.get_bind.return_value.dialect.name = "postgresql"
+        session.execute.return_value.one.return_value = (2_500_000, True, 12, None, None, None, None)
+        
+        result = _query_dashboard_stats(session)
+        
+        assert result.total_assets == 2_500_000
+        assert result.total_is_estimate is True
+        # Estimate and COUNT(*) fallback are chosen inside the one aggregate SELECT
+        session.execute.assert_called_once()
+        assert "reltuples" in str(session.execute.call_args[0][0])
+    
+    def test_exact_total_skips_planner_estimate(self, db_session):
+        """Test that an exact refresh never consults the planner estimate."""
+        db_session.get_bind.return_value.dialect.name = "postgresql"
+        db_session.execute.return_value.one.return_value = (2_500_001, False, 12, None, None, None, None)
+        db_session.execute.return_value.all.return_value = []
+        
+        stats, recent_assets = dashboard_snapshot(exact_total=True)
+        
+        assert stats.total_assets == 2_500_001
+        assert stats.total_is_estimate is False
+        assert db_session.execute.call_count == 2  # stats + recent assets
+        assert "reltuples" not in str(db_session.execute.call_args_list[0][0][0])
+    
+    def test_dashboard_reads_heartbeats_in_one_query(self, db_session):
+        """Test that several service heartbeats are read with a single query."""
+        librarian = SimpleNamespace(service_name="librarian", last_heartbeat=datetime.now(), status="OK",
+                                    current_task="Idle", updated_at=datetime.now())
+        syncthing = SimpleNamespace(service_name="syncthing", last_heartbeat=datetime.now(), status="OK",
+                                    current_task=None, updated_at=datetime.now())
+        db_session.execute.return_value.all.return_value = [librarian, syncthing]
+        
+        result = get_heartbeats_for(("factory-db", "librarian", "syncthing"))
+        
+        db_session.execute.assert_called_once()
+        assert set(result) == {"librarian", "syncthing"}
+        assert result["librarian"]["current_task"] == "Idle"
 
 
 class TestDashboardDockerIntegration:
@@ -82,13 +136,13 @@ class TestDashboardDockerIntegration:
         with patch('Src.Dashboard.dashboard.DOCKER_AVAILABLE', True):
             # This test verifies the dashboard can interact with Docker
             # We'll mock the actual Docker client to avoid requiring Docker in tests
-            with patch('Src.Dashboard.dashboard.docker_client') as mock_client:
-                # Mock container list
-                mock_container1 = Mock()
-                mock_container1.name = "librarian"
-                mock_container2 = Mock()
-                mock_container2.name = "dashboard"
-                mock_client.containers.list.return_value = [mock_container1, mock_container2]
+            with patch('Src.Dashboard.dashboard.docker_client') as mock_client, \
+                 patch('Src.Dashboard.dashboard._get_container_poller', return_value=ContainerPoller()):
+                # Mock container list (low-level /containers/json summaries)
+                mock_client.api.containers.return_value = [
+                    {"Names": ["/librarian"], "Image": "photo-factory-librarian", "State": "running", "Status": "Up 2 hours"},
+                    {"Names": ["/dashboard"], "Image": "photo-factory-dashboard", "State": "running", "Status": "Up 2 hours"},
+                ]
                 
                 result = get_available_services()
                 
@@ -96,15 +150,50 @@ class TestDashboardDockerIntegration:
                 assert isinstance(result, list)
                 assert len(result) >= 0  # May be empty or contain services
     
+    def test_container_status_read_from_single_listing(self):
+        """Test that container status/health come from one polled containers listing."""
+        with patch('Src.Dashboard.dashboard.DOCKER_AVAILABLE', True), \
+             patch('Src.Dashboard.dashboard._get_container_poller', return_value=ContainerPoller()), \
+             patch('Src.Dashboard.dashboard.docker_client') as mock_client:
+            mock_client.api.containers.return_value = [
+                {"Names": ["/librarian"], "Image": "photo-factory-librarian", "State": "running", "Status": "Up 5 minutes (healthy)"},
+                {"Names": ["/factory_postgres"], "Image": "postgres:16", "State": "running", "Status": "Up 5 minutes (unhealthy)"},
+                {"Names": ["/syncthing"], "Image": "syncthing/syncthing", "State": "exited", "Status": "Exited (0) 1 hour ago"},
+            ]
+            
+            assert get_container_status("librarian") == {"status": "running", "health": "healthy", "running": True}
+            assert get_container_status("factory_postgres")["health"] == "unhealthy"
+            assert get_container_status("syncthing") == {"status": "exited", "health": "unknown", "running": False}
+            assert get_container_status("missing")["status"] == "not_found"
+            
+            # One label-filtered listing call serves every lookup (no per-container inspect)
+            mock_client.api.containers.assert_called_once_with(
+                all=True, filters={"label": "com.docker.compose.project=photo-factory"}
+            )
+            mock_client.containers.get.assert_not_called()
+    
+    def test_container_poller_refetches_stale_snapshot(self):
+        """Test that the poller serves fresh snapshots from memory and refetches stale ones."""
+        fetch = Mock(side_effect=[{"librarian": {}}, {"librarian": {}, "dashboard": {}}])
+        poller = ContainerPoller(fetch=fetch, interval=2.0)
+        
+        with patch('Src.Dashboard.dashboard.time.monotonic', return_value=100.0):
+            assert poller.snapshot() == {"librarian": {}}
+            assert poller.snapshot() == {"librarian": {}}
+        assert fetch.call_count == 1
+        
+        # Past max_age (3 intervals) the next read fetches synchronously
+        with patch('Src.Dashboard.dashboard.time.monotonic', return_value=107.0):
+            assert "dashboard" in poller.snapshot()
+        assert fetch.call_count == 2
+    
     def test_dashboard_aggregates_service_status(self):
         """Test that dashboard can aggregate status from multiple services."""
-        get_all_services_status.clear()
-        
         # Mock Docker and database responses
         with patch('Src.Dashboard.dashboard.DOCKER_AVAILABLE', True), \
              patch('Src.Dashboard.dashboard.get_available_services', return_value=["librarian", "dashboard"]), \
              patch('Src.Dashboard.dashboard.get_container_status') as mock_container, \
-             patch('Src.Dashboard.dashboard.get_service_heartbeat') as mock_heartbeat:
+             patch('Src.Dashboard.dashboard.get_heartbeats_for') as mock_heartbeats:
             
             # Mock container status
             mock_container.side_effect = [
@@ -112,11 +201,10 @@ class TestDashboardDockerIntegration:
                 {"running": True, "health": "healthy"},  # dashboard
             ]
             
-            # Mock heartbeat
-            mock_heartbeat.side_effect = [
-                {"last_heartbeat": datetime.now() - timedelta(seconds=30), "status": "OK"},
-                None,  # dashboard might not have heartbeat
-            ]
+            # Mock heartbeats (dashboard might not have one)
+            mock_heartbeats.return_value = {
+                "librarian": {"last_heartbeat": datetime.now() - timedelta(seconds=30), "status": "OK"},
+            }
             
             result = get_all_services_status()
             
@@ -127,37 +215,103 @@ class TestDashboardDockerIntegration:
             assert result[1]["name"] == "dashboard"
 
 
-class TestDashboardServiceInteraction:
-    """Test how dashboard interacts with other services."""
+class TestDashboardLogs:
+    """Test dashboard log fetching from Docker."""
     
-    def test_dashboard_handles_missing_service_gracefully(self):
-        """Test that dashboard handles missing services gracefully."""
-        get_service_heartbeat.clear()
+    def test_all_logs_merged_by_timestamp_and_bounded(self):
+        """Test that get_all_logs merges service tails in time order and keeps only the newest lines."""
+        streams = {
+            "librarian": [b"2024-01-01T00:00:01.000000000Z lib one\n2024-01-01T00:00:03.000000000Z lib", b" two\n"],
+            "dashboard": [b"2024-01-01T00:00:02.000000000Z dash one\n2024-01-01T00:00:04.000000000Z dash two\n"],
+        }
+        
+        with patch('Src.Dashboard.dashboard.DOCKER_AVAILABLE', True), \
+             patch('Src.Dashboard.dashboard.docker_client') as mock_client:
+            mock_client.api.logs.side_effect = lambda name, **kwargs: iter(streams[name])
+            
+            result = get_all_logs(("librarian", "dashboard"), tail=50, limit=3)
+            
+            assert [entry[1:] for entry in result] == [
+                ("dashboard", "dash one"),
+                ("librarian", "lib two"),
+                ("dashboard", "dash two"),
+            ]
+            # Docker bounds each fetch by time as well as line count
+            for call in mock_client.api.logs.call_args_list:
+                assert call.kwargs["tail"] == 50
+                assert "since" in call.kwargs
+    
+    def test_service_logs_decode_utf8_split_across_chunks(self):
+        """Test that multi-byte characters split between stream chunks decode intact."""
+        line = "2024-01-01T00:00:01.000000000Z caf\u00e9 ready\n".encode("utf-8")
+        split_at = line.index(b"\xc3") + 1
         
-        with patch('Src.Dashboard.dashboard.get_db_session') as mock_session:
-            # Simulate service not found in database
-            mock_query = Mock()
-            mock_query.filter.return_value.first.return_value = None
+        with patch('Src.Dashboard.dashboard.DOCKER_AVAILABLE', True), \
+             patch('Src.Dashboard.dashboard.docker_client') as mock_client:
+            mock_client.api.logs.return_value = iter([line[:split_at], line[split_at:]])
+            
+            result = list(_stream_log_lines("librarian", tail=10))
             
-            mock_session_obj = Mock()
-            mock_session_obj.__enter__ = Mock(return_value=mock_session_obj)
-            mock_session_obj.__exit__ = Mock(return_value=False)
-            mock_session_obj.query.return_value = mock_query
-            mock_session.return_value = mock_session_obj
+            assert result == ["2024-01-01T00:00:01.000000000Z caf\u00e9 ready"]
+    
+    def test_incremental_logs_fetch_only_new_lines(self):
+        """Test that repeat log fetches request lines since the last seen timestamp."""
+        session_state = {}
+        first = [b"2024-01-01T00:00:01.000000000Z one\n2024-01-01T00:00:02.500000000Z two\n"]
+        # `since` has second resolution, so Docker may resend the last line
+        second = [b"2024-01-01T00:00:02.500000000Z two\n2024-01-01T00:00:03.000000000Z three\n"]
+        
+        with patch('Src.Dashboard.dashboard.DOCKER_AVAILABLE', True), \
+             patch('Src.Dashboard.dashboard.st.session_state', session_state), \
+             patch('Src.Dashboard.dashboard.docker_client') as mock_client:
+            mock_client.api.logs.side_effect = [iter(first), iter(second)]
+            
+            get_incremental_service_logs("librarian", tail=100)
+            result = get_incremental_service_logs("librarian", tail=100)
+            
+            assert "since" not in mock_client.api.logs.call_args_list[0].kwargs
+            assert mock_client.api.logs.call_args_list[1].kwargs["since"] == 1704067202
+            assert [line.split(" ", 1)[1] for line in result.split("\n")] == ["one", "two", "three"]
+    
+    def test_incremental_logs_keep_buffer_on_fetch_error(self):
+        """Test that a failed refresh shows buffered lines, or an error note if there are none."""
+        session_state = {}
+        first = [b"2024-01-01T00:00:01.000000000Z one\n"]
+        
+        with patch('Src.Dashboard.dashboard.DOCKER_AVAILABLE', True), \
+             patch('Src.Dashboard.dashboard.st.session_state', session_state), \
+             patch('Src.Dashboard.dashboard.docker_client') as mock_client:
+            mock_client.api.logs.side_effect = Exception("Docker API error")
+            assert get_incremental_service_logs("librarian", tail=100) == (
+                "[Error fetching logs from librarian: Docker API error]"
+            )
             
-            result = get_service_heartbeat("nonexistent_service")
+            mock_client.api.logs.side_effect = [iter(first), Exception("Docker API error")]
+            get_incremental_service_logs("librarian", tail=100)
+            result = get_incremental_service_logs("librarian", tail=100)
             
-            # Should return None, not crash
-            assert result is None
+            assert result == "2024-01-01T00:00:01.000000000Z one"
+
+
+class TestDashboardServiceInteraction:
+    """Test how dashboard interacts with other services."""
+    
+    def test_dashboard_handles_missing_service_gracefully(self, db_session):
+        """Test that dashboard handles missing services gracefully."""
+        # Simulate service not found in database
+        db_session.execute.return_value.first.return_value = None
+        
+        result = get_service_heartbeat("nonexistent_service")
+        
+        # Should return None, not crash
+        assert result is None
     
     def test_dashboard_handles_partial_service_failures(self):
         """Test that dashboard handles partial service failures (some services up, some down)."""
-        get_all_services_status.clear()
-        
         with patch('Src.Dashboard.dashboard.DOCKER_AVAILABLE', True), \
              patch('Src.Dashboard.dashboard.get_available_services', return_value=["librarian", "dashboard", "factory-db"]), \
              patch('Src.Dashboard.dashboard.get_container_status') as mock_container, \
-             patch('Src.Dashboard.dashboard.get_service_heartbeat') as mock_heartbeat:
+             patch('Src.Dashboard.dashboard.get_heartbeats_for') as mock_heartbeats:
             
             # Simulate mixed status: one service healthy, one unhealthy, one not found
             mock_container.side_effect = [
@@ -166,11 +320,9 @@ class TestDashboardServiceInteraction:
                 None,  # factory-db - error getting status
             ]
             
-            mock_heartbeat.side_effect = [
-                {"last_heartbeat": datetime.now() - timedelta(seconds=30), "status": "OK"},
-                None,
-                None,
-            ]
+            mock_heartbeats.return_value = {
+                "librarian": {"last_heartbeat": datetime.now() - timedelta(seconds=30), "status": "OK"},
+            }
             
             result = get_all_services_status()
             
@@ -184,3 +336,25 @@ class TestDashboardServiceInteraction:
                 assert "container_health" in svc
                 assert "heartbeat" in svc
 
+
+class TestDashboardPrefetch:
+    """Test the live view's shared prefetch pool."""
+    
+    def test_script_context_detached_after_each_task(self):
+        """Test that a pool thread only carries a session's context while running its task."""
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        
+        ctx = MagicMock()
+        current_ctx = lambda: get_script_run_ctx(suppress_warning=True)
+        
+        def fail():
+            raise RuntimeError("query failed")
+        
+        # One worker, so every task below runs on the same thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(_run_with_script_ctx, ctx, current_ctx).result() is ctx
+            assert executor.submit(current_ctx).result() is None
+            
+            with pytest.raises(RuntimeError):
+                executor.submit(_run_with_script_ctx, ctx, fail).result()
+            assert executor.submit(current_ctx).result() is None
@@ -0,0 +1,65 @@
+"""
+Tests for the "Latest Processed Files" table.
+
+Verifies the vectorized DataFrame build (sizes in MB, datetime columns for
+client-side formatting, truncated paths, fallbacks for missing values).
+"""
+import pandas as pd
+import pytest
+from datetime import datetime
+
+from Src.Dashboard.dashboard import build_recent_assets_frame
+
+
+class TestBuildRecentAssetsFrame:
+    """Test recent assets table formatting."""
+    
+    def test_formats_size_and_timestamps(self):
+        """Test that size is in MB and timestamps stay datetimes for column_config."""
+        df = build_recent_assets_frame([(
+            "IMG_0001.jpg",  # original_name
+            3 * 1024 * 1024,  # size_bytes
+            datetime(2024, 5, 1, 12, 30, 45),  # captured_at
+            datetime(2024, 5, 2, 8, 15, 5),  # ingested_at
+            "/Storage/Originals/2024/05/IMG_0001.jpg",  # final_path
+        )])
+        
+        row = df.iloc[0]
+        assert list(df.columns) == ["File", "Size", "Captured", "Ingested", "Path"]
+        assert row["File"] == "IMG_0001.jpg"
+        assert row["Size"] == 3.0
+        assert row["Captured"] == pd.Timestamp(2024, 5, 1, 12, 30, 45)
+        assert row["Ingested"] == pd.Timestamp(2024, 5, 2, 8, 15, 5)
+        assert row["Path"] == "/Storage/Originals/2024/05/IMG_0001.jpg"
+    
+    def test_missing_capture_date_shows_na(self):
+        """Test that assets without EXIF capture date get an empty (NaT) cell."""
+        df = build_recent_assets_frame([
+            (
+                "a.jpg",  # original_name
+                1024,  # size_bytes
+                None,  # captured_at
+                datetime(2024, 5, 2, 8, 15, 5),  # ingested_at
+                "/a.jpg",  # final_path
+            ),
+            (
+                "b.jpg",  # original_name
+                2048,  # size_bytes
+                datetime(2024, 5, 1, 12, 30),  # captured_at
+                datetime(2024, 5, 2, 8, 15, 6),  # ingested_at
+                "/b.jpg",  # final_path
+            ),
+        ])
+        
+        assert df["Captured"].isna().tolist() == [True, False]
+        assert df["Captured"].iloc[1] == pd.Timestamp(2024, 5, 1, 12, 30)
+    
+    def test_long_paths_are_truncated(self):
+        """Test that paths over 50 characters are truncated with an ellipsis."""
+        long_path = "/Storage/Originals/" + "x" * 60 + ".jpg"
+        df = build_recent_assets_frame([("long.jpg", 0, None, None, long_path)])
+        
+        row = df.iloc[0]
+        assert row["Path"] == long_path[:50] + "..."
+        assert pd.isna(row["Ingested"])
+        assert row["Size"] == 0.0
@@ -5,13 +5,16 @@ Verifies that dashboard correctly displays all services and their heartbeats.
 """
 import pytest
 from datetime import datetime, timedelta
-from unittest.mock import Mock, patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
 
 from Src.Dashboard.dashboard import (
     get_all_services_status,
     get_service_heartbeat,
     get_available_services,
+    ContainerPoller,
     DOCKER_AVAILABLE,
+    resolve_service_name,
 )
 
 
@@ -20,8 +23,6 @@ class TestDashboardServiceMonitoring:
     
     def test_get_all_services_status_includes_all_critical_services(self):
         """Test that get_all_services_status includes all critical services."""
-        get_all_services_status.clear()
-        
         with patch('Src.Dashboard.dashboard.DOCKER_AVAILABLE', True):
             with patch('Src.Dashboard.dashboard.get_available_services') as mock_services:
                 mock_services.return_value = [
@@ -38,12 +39,13 @@ class TestDashboardServiceMonitoring:
                         "health": "healthy"
                     }
                     
-                    with patch('Src.Dashboard.dashboard.get_service_heartbeat') as mock_heartbeat:
-                        mock_heartbeat.return_value = {
+                    with patch('Src.Dashboard.dashboard.get_heartbeats_for') as mock_heartbeats:
+                        heartbeat = {
                             "last_heartbeat": datetime.now() - timedelta(seconds=30),
                             "status": "OK",
                             "current_task": "Running"
                         }
+                        mock_heartbeats.side_effect = lambda names: dict.fromkeys(names, heartbeat)
                         
                         result = get_all_services_status()
                         
@@ -58,8 +60,6 @@ class TestDashboardServiceMonitoring:
     
     def test_service_name_mapping_correct(self):
         """Test that container names are correctly mapped to service names."""
-        get_all_services_status.clear()
-        
         with patch('Src.Dashboard.dashboard.DOCKER_AVAILABLE', True):
             with patch('Src.Dashboard.dashboard.get_available_services') as mock_services:
                 mock_services.return_value = ["factory_postgres", "syncthing"]
@@ -67,23 +67,23 @@ class TestDashboardServiceMonitoring:
                 with patch('Src.Dashboard.dashboard.get_container_status') as mock_container:
                     mock_container.return_value = {"running": True, "health": "healthy"}
                     
-                    with patch('Src.Dashboard.dashboard.get_service_heartbeat') as mock_heartbeat:
-                        mock_heartbeat.return_value = {
+                    with patch('Src.Dashboard.dashboard.get_heartbeats_for') as mock_heartbeats:
+                        heartbeat = {
                             "last_heartbeat": datetime.now(),
                             "status": "OK"
                         }
+                        mock_heartbeats.side_effect = lambda names: dict.fromkeys(names, heartbeat)
                         
                         result = get_all_services_status()
                         
-                        # Verify service name mapping
-                        heartbeat_calls = [call[0][0] for call in mock_heartbeat.call_args_list]
-                        assert "factory-db" in heartbeat_calls  # factory_postgres -> factory-db
-                        assert "syncthing" in heartbeat_calls  # syncthing -> syncthing
+                        # Verify service name mapping (all heartbeats fetched in one batch)
+                        mock_heartbeats.assert_called_once()
+                        heartbeat_names = mock_heartbeats.call_args[0][0]
+                        assert "factory-db" in heartbeat_names  # factory_postgres -> factory-db
+                        assert "syncthing" in heartbeat_names  # syncthing -> syncthing
     
     def test_dashboard_shows_heartbeat_for_all_services(self):
         """Test that dashboard shows heartbeat information for all services."""
-        get_all_services_status.clear()
-        
         with patch('Src.Dashboard.dashboard.DOCKER_AVAILABLE', True):
             with patch('Src.Dashboard.dashboard.get_available_services') as mock_services:
                 mock_services.return_value = ["librarian", "factory_postgres", "syncthing"]
@@ -91,12 +91,13 @@ class TestDashboardServiceMonitoring:
                 with patch('Src.Dashboard.dashboard.get_container_status') as mock_container:
                     mock_container.return_value = {"running": True, "health": "healthy"}
                     
-                    with patch('Src.Dashboard.dashboard.get_service_heartbeat') as mock_heartbeat:
-                        mock_heartbeat.return_value = {
+                    with patch('Src.Dashboard.dashboard.get_heartbeats_for') as mock_heartbeats:
+                        heartbeat = {
                             "last_heartbeat": datetime.now() - timedelta(seconds=45),
                             "status": "OK",
                             "current_task": "Processing"
                         }
+                        mock_heartbeats.side_effect = lambda names: dict.fromkeys(names, heartbeat)
                         
                         result = get_all_services_status()
                         
@@ -108,8 +109,6 @@ class TestDashboardServiceMonitoring:
     
     def test_dashboard_handles_missing_heartbeat_gracefully(self):
         """Test that dashboard handles services without heartbeat gracefully."""
-        get_all_services_status.clear()
-        
         with patch('Src.Dashboard.dashboard.DOCKER_AVAILABLE', True):
             with patch('Src.Dashboard.dashboard.get_available_services') as mock_services:
                 mock_services.return_value = ["librarian", "unknown_service"]
@@ -117,17 +116,14 @@ class TestDashboardServiceMonitoring:
                 with patch('Src.Dashboard.dashboard.get_container_status') as mock_container:
                     mock_container.return_value = {"running": True, "health": "healthy"}
                     
-                    with patch('Src.Dashboard.dashboard.get_service_heartbeat') as mock_heartbeat:
-                        # Return heartbeat for librarian, None for unknown
-                        def side_effect(service_name):
-                            if service_name == "librarian":
-                                return {
-                                    "last_heartbeat": datetime.now(),
-                                    "status": "OK"
-                                }
-                            return None
-                        
-                        mock_heartbeat.side_effect = side_effect
+                    with patch('Src.Dashboard.dashboard.get_heartbeats_for') as mock_heartbeats:
+                        # Only librarian has a heartbeat row
+                        mock_heartbeats.return_value = {
+                            "librarian": {
+                                "last_heartbeat": datetime.now(),
+                                "status": "OK"
+                            }
+                        }
                         
                         result = get_all_services_status()
                         
@@ -137,71 +133,38 @@ class TestDashboardServiceMonitoring:
                         unknown_svc = [svc for svc in result if svc["name"] == "unknown_service"][0]
                         assert unknown_svc["heartbeat"] is None
     
-    def test_get_service_heartbeat_returns_correct_format(self):
+    def test_get_service_heartbeat_returns_correct_format(self, db_session):
         """Test that get_service_heartbeat returns correct dictionary format."""
-        get_service_heartbeat.clear()
-        
         recent_time = datetime.now() - timedelta(seconds=30)
+        db_session.execute.return_value.first.return_value = SimpleNamespace(
+            last_heartbeat=recent_time, status="OK", current_task="Processing files", updated_at=datetime.now()
+        )
+        
+        result = get_service_heartbeat("librarian")
         
-        with patch('Src.Dashboard.dashboard.get_db_session') as mock_session:
-            mock_status = Mock()
-            mock_status.last_heartbeat = recent_time
-            mock_status.status = "OK"
-            mock_status.current_task = "Processing files"
-            mock_status.updated_at = datetime.now()
-            
-            mock_query = Mock()
-            mock_query.filter.return_value.first.return_value = mock_status
-            
-            mock_session_obj = Mock()
-            mock_session_obj.__enter__ = Mock(return_value=mock_session_obj)
-            mock_session_obj.__exit__ = Mock(return_value=False)
-            mock_session_obj.query.return_value = mock_query
-            mock_session.return_value = mock_session_obj
-            
-            result = get_service_heartbeat("librarian")
-            
-            assert result is not None
-            assert result["last_heartbeat"] == recent_time
-            assert result["status"] == "OK"
-            assert result["current_task"] == "Processing files"
-            assert "updated_at" in result
+        assert result is not None
+        assert result["last_heartbeat"] == recent_time
+        assert result["status"] == "OK"
+        assert result["current_task"] == "Processing files"
+        assert "updated_at" in result
     
-    def test_get_service_heartbeat_returns_none_when_no_record(self):
+    def test_get_service_heartbeat_returns_none_when_no_record(self, db_session):
         """Test that get_service_heartbeat returns None when no record exists."""
-        get_service_heartbeat.clear()
+        db_session.execute.return_value.first.return_value = None
         
-        with patch('Src.Dashboard.dashboard.get_db_session') as mock_session:
-            mock_query = Mock()
-            mock_query.filter.return_value.first.return_value = None
-            
-            mock_session_obj = Mock()
-            mock_session_obj.__enter__ = Mock(return_value=mock_session_obj)
-            mock_session_obj.__exit__ = Mock(return_value=False)
-            mock_session_obj.query.return_value = mock_query
-            mock_session.return_value = mock_session_obj
-            
-            result = get_service_heartbeat("nonexistent-service")
-            
-            assert result is None
+        result = get_service_heartbeat("nonexistent-service")
+        
+        assert result is None
     
     def test_dashboard_includes_service_monitor_in_list(self):
         """Test that service_monitor container is included in available services."""
-        get_available_services.clear()
-        
         with patch('Src.Dashboard.dashboard.DOCKER_AVAILABLE', True):
-            with patch('Src.Dashboard.dashboard.docker_client') as mock_docker:
-                mock_container1 = Mock()
-                mock_container1.name = "librarian"
-                mock_container2 = Mock()
-                mock_container2.name = "service_monitor"
-                mock_container3 = Mock()
-                mock_container3.name = "factory_postgres"
-                
-                mock_docker.containers.list.return_value = [
-                    mock_container1,
-                    mock_container2,
-                    mock_container3
+            with patch('Src.Dashboard.dashboard.docker_client') as mock_docker, \
+                 patch('Src.Dashboard.dashboard._get_container_poller', return_value=ContainerPoller()):
+                mock_docker.api.containers.return_value = [
+                    {"Names": ["/librarian"], "Image": "photo-factory-librarian", "State": "running", "Status": "Up 1 hour"},
+                    {"Names": ["/service_monitor"], "Image": "photo-factory-service-monitor", "State": "running", "Status": "Up 1 hour"},
+                    {"Names": ["/factory_postgres"], "Image": "postgres:16", "State": "running", "Status": "Up 1 hour (healthy)"},
                 ]
                 
                 result = get_available_services()
@@ -213,8 +176,6 @@ class TestDashboardServiceMonitoring:
     
     def test_service_monitor_appears_in_all_services_status(self):
         """Test that service_monitor appears in all services status even without heartbeat."""
-        get_all_services_status.clear()
-        
         with patch('Src.Dashboard.dashboard.DOCKER_AVAILABLE', True):
             with patch('Src.Dashboard.dashboard.get_available_services') as mock_services:
                 mock_services.return_value = ["librarian", "service_monitor"]
@@ -222,14 +183,11 @@ class TestDashboardServiceMonitoring:
                 with patch('Src.Dashboard.dashboard.get_container_status') as mock_container:
                     mock_container.return_value = {"running": True, "health": "healthy"}
                     
-                    with patch('Src.Dashboard.dashboard.get_service_heartbeat') as mock_heartbeat:
-                        # service_monitor doesn't have a heartbeat (returns None)
-                        def side_effect(service_name):
-                            if service_name == "librarian":
-                                return {"last_heartbeat": datetime.now(), "status": "OK"}
-                            return None  # service_monitor has no heartbeat
-                        
-                        mock_heartbeat.side_effect = side_effect
+                    with patch('Src.Dashboard.dashboard.get_heartbeats_for') as mock_heartbeats:
+                        # service_monitor doesn't have a heartbeat (not in the batch result)
+                        mock_heartbeats.return_value = {
+                            "librarian": {"last_heartbeat": datetime.now(), "status": "OK"}
+                        }
                         
                         result = get_all_services_status()
                         
@@ -244,3 +202,19 @@ class TestDashboardServiceMonitoring:
                         assert service_monitor["heartbeat"] is None
                         assert service_monitor["container_running"] is True
 
+
+class TestResolveServiceName:
+    """Test container name to heartbeat service name mapping."""
+    
+    @pytest.mark.parametrize("container_name,expected", [
+        ("librarian", "librarian"),
+        ("factory_postgres", "factory-db"),
+        ("syncthing", "syncthing"),
+        ("service_monitor", None),
+        ("immich_server", None),
+        ("newservice_worker", "newservice"),
+        ("standalone", "standalone"),
+    ])
+    def test_resolve_service_name(self, container_name, expected):
+        """Known containers use the explicit map; others fall back to the prefix before "_"."""
+        assert resolve_service_name(container_name) == expected
@@ -6,13 +6,17 @@ import pytest
 from datetime import datetime, timedelta
 from unittest.mock import patch
 
-from Src.Dashboard.dashboard import get_all_services_status
+from Src.Dashboard.dashboard import (
+    HEARTBEAT_ICONS,
+    _heartbeat_age,
+    _heartbeat_level,
+    get_all_services_status,
+    service_max_interval,
+)
 
 
 def test_syncthing_102s_should_be_green():
     """Test that syncthing at 102s shows green (102/300 = 0.34 < 1.0)."""
-    get_all_services_status.clear()
-    
     with patch('Src.Dashboard.dashboard.DOCKER_AVAILABLE', True):
         with patch('Src.Dashboard.dashboard.get_available_services') as mock_services:
             mock_services.return_value = ["syncthing"]
@@ -20,12 +24,14 @@ def test_syncthing_102s_should_be_green():
             with patch('Src.Dashboard.dashboard.get_container_status') as mock_container:
                 mock_container.return_value = {"running": True, "health": "healthy"}
                 
-                with patch('Src.Dashboard.dashboard.get_service_heartbeat') as mock_heartbeat:
+                with patch('Src.Dashboard.dashboard.get_heartbeats_for') as mock_heartbeats:
                     # Syncthing at 102 seconds (should be green)
-                    mock_heartbeat.return_value = {
-                        "last_heartbeat": datetime.now() - timedelta(seconds=102),
+                    now = datetime.now()
+                    heartbeat = {
+                        "last_heartbeat": now - timedelta(seconds=102),
                         "status": "OK"
                     }
+                    mock_heartbeats.return_value = {"syncthing": heartbeat}
                     
                     result = get_all_services_status()
                     
@@ -36,31 +42,17 @@ def test_syncthing_102s_should_be_green():
                     assert svc["heartbeat"] is not None
                     
                     # Now test the display logic (simulate what happens in the table)
-                    service_intervals = {
-                        "librarian": 60,
-                        "dashboard": 300,
-                        "factory-db": 300,
-                        "syncthing": 300,
-                    }
-                    
-                    service_name = svc.get("service_name")
-                    expected_interval = service_intervals.get(service_name, 300)
+                    expected_interval = service_max_interval(svc.get("service_name"))
                     
-                    time_since = datetime.now() - svc["heartbeat"]["last_heartbeat"]
-                    seconds_ago = int(time_since.total_seconds())
+                    seconds_ago, _ = _heartbeat_age(svc["heartbeat"]["last_heartbeat"], expected_interval, now)
                     
                     # Verify the calculation
                     assert seconds_ago == 102, f"Expected 102s, got {seconds_ago}s"
                     assert expected_interval == 300, f"Expected 300s interval, got {expected_interval}s"
                     assert seconds_ago <= expected_interval, f"{seconds_ago}s should be <= {expected_interval}s for green"
                     
-                    # Verify color using implementation logic (uses <=)
-                    if seconds_ago <= expected_interval:
-                        color = "🟢"
-                    elif seconds_ago <= expected_interval * 2:
-                        color = "🟡"
-                    else:
-                        color = "🔴"
+                    # Classify with the dashboard's own helper
+                    color = HEARTBEAT_ICONS[_heartbeat_level(seconds_ago, expected_interval)]
                     
                     assert color == "🟢", f"Expected green for 102s, got {color}"
                     
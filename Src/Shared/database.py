@@ -3,6 +3,7 @@ Database connection and session management using SQLAlchemy.
 """
 import logging
 import os
+import time
 from contextlib import contextmanager
 from typing import Generator, Optional
 
@@ -24,16 +25,34 @@ DATABASE_URL = os.getenv(
     ),
 )
 
+# Seconds to wait for a new PostgreSQL connection before giving up. Opt-in:
+# unset leaves libpq's default (wait on the OS TCP timeout).
+DB_CONNECT_TIMEOUT = int(os.environ["DB_CONNECT_TIMEOUT"]) if os.getenv("DB_CONNECT_TIMEOUT") else None
+
+# Seconds to wait for a free pooled connection (SQLAlchemy's default is 30).
+# Interactive services like the dashboard set a lower value to fail fast;
+# background services keep queueing through bursts of contention.
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+# Statements slower than this (milliseconds) are logged as warnings. Opt-in:
+# unset means no per-statement timing hooks are installed.
+SLOW_QUERY_MS = float(os.environ["DB_SLOW_QUERY_MS"]) if os.getenv("DB_SLOW_QUERY_MS") else None
+
 # Engine configuration
 # Use NullPool for single-threaded services, QueuePool for multi-threaded
 _engine = None
 _SessionLocal = None
+_ReadOnlySessionLocal = None
 
 
 def get_engine():
     """Get or create the database engine."""
     global _engine
     if _engine is None:
+        # Optionally fail fast when the DB host is unreachable (see DB_CONNECT_TIMEOUT)
+        connect_args = {}
+        if DB_CONNECT_TIMEOUT is not None and DATABASE_URL.startswith("postgresql"):
+            connect_args["connect_timeout"] = DB_CONNECT_TIMEOUT
         # Use QueuePool for connection pooling (better for concurrent access)
         _engine = create_engine(
             DATABASE_URL,
@@ -41,12 +60,38 @@ def get_engine():
             pool_size=5,
             max_overflow=10,
             pool_pre_ping=True,  # Verify connections before using
+            pool_recycle=1800,  # Replace connections older than 30 minutes
+            pool_timeout=DB_POOL_TIMEOUT,
             echo=False,  # Set to True for SQL debugging
+            connect_args=connect_args,
         )
+        if SLOW_QUERY_MS is not None:
+            _install_slow_query_logging(_engine)
         logger.info(f"Database engine created for {DATABASE_URL.split('@')[1] if '@' in DATABASE_URL else 'database'}")
     return _engine
 
 
+def _install_slow_query_logging(engine):
+    """Log statements that take longer than SLOW_QUERY_MS to execute."""
+    
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+    
+    @event.listens_for(engine, "after_cursor_execute")
+    def _log_slow_query(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+        if elapsed_ms > SLOW_QUERY_MS:
+            logger.warning(f"Slow query ({elapsed_ms:.0f}ms): {statement}")
+    
+    @event.listens_for(engine, "handle_error")
+    def _discard_timer(exception_context):
+        # Failed statements never reach after_cursor_execute; drop their start time
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start_time"):
+            conn.info["query_start_time"].pop()
+
+
 def get_session_factory():
     """Get or create the session factory."""
     global _SessionLocal
@@ -59,16 +104,45 @@ def get_session_factory():
     return _SessionLocal
 
 
+def get_readonly_session_factory():
+    """
+    Get or create the read-only session factory.
+    
+    Sessions are bound to the shared engine with AUTOCOMMIT isolation, so pure
+    reads don't open (and later commit) an implicit transaction.
+    """
+    global _ReadOnlySessionLocal
+    if _ReadOnlySessionLocal is None:
+        _ReadOnlySessionLocal = sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            bind=get_engine().execution_options(isolation_level="AUTOCOMMIT"),
+        )
+    return _ReadOnlySessionLocal
+
+
 @contextmanager
-def get_db_session() -> Generator[Session, None, None]:
+def get_db_session(readonly: bool = False) -> Generator[Session, None, None]:
     """
     Context manager for database sessions.
     
+    Args:
+        readonly: Use an AUTOCOMMIT session for pure reads (no transaction
+            begin/commit round trips). Writes must use the default session.
+    
     Usage:
         with get_db_session() as session:
             # Use session
             session.commit()
     """
+    if readonly:
+        session = get_readonly_session_factory()()
+        try:
+            yield session
+        finally:
+            session.close()
+        return
+    
     session_factory = get_session_factory()
     session = session_factory()
     try:
@@ -59,6 +59,8 @@ class MediaAsset(Base):
     # Indexes for common queries
     __table_args__ = (
         Index("idx_media_assets_captured_at", "captured_at"),
+        # B-tree (not BRIN): serves the dashboard's "last hour" range count and
+        # its ORDER BY ingested_at DESC LIMIT n recent-files query
         Index("idx_media_assets_ingested_at", "ingested_at"),
         Index("idx_media_assets_is_geocoded", "is_geocoded"),
         Index("idx_media_assets_is_backed_up", "is_backed_up"),